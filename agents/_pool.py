@@ -0,0 +1,66 @@
+"""
+Connection Pool
+===============
+Process-wide psycopg2 connection pools shared by every DatabaseConnection.
+One pool is kept per distinct connection config, so agents, the
+orchestrator and the API reuse warm connections instead of paying for
+TCP + TLS + auth on each call.
+"""
+
+from typing import Dict
+import os
+import threading
+
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+# Seconds getconn() waits for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+_POOLS: Dict[tuple, "BlockingConnectionPool"] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that waits for a free connection.
+
+    psycopg2's pool raises PoolError as soon as maxconn connections are
+    checked out. Here getconn() blocks for up to `timeout` seconds first,
+    so concurrent agents queue briefly instead of failing.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, *args, timeout: float = POOL_TIMEOUT, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(
+                f"connection pool exhausted: no connection freed within {self.timeout}s"
+            )
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        super().putconn(conn, key, close)
+        self._slots.release()
+
+
+def get_pool(config: dict) -> BlockingConnectionPool:
+    """Get (or lazily create) the process-wide pool for a connection config."""
+    key = tuple(sorted(config.items()))
+    pool = _POOLS.get(key)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(key)
+            if pool is None:
+                pool = BlockingConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE, **config)
+                _POOLS[key] = pool
+    return pool
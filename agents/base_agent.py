@@ -6,18 +6,26 @@ Includes SQL guardrails for defense-in-depth security.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from decimal import Decimal
-from datetime import date, datetime
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor, execute_batch, execute_values
+from collections import OrderedDict
+from contextlib import contextmanager
+import asyncio
+import hashlib
+import itertools
 import os
+import re
+import weakref
 
 from .contract import (
     AgentOutput, AgentRole, KPI, Recommendation, Evidence,
     Trend, Confidence, validate_agent_output
 )
 from .sql_guardrails import SQLGuardrails, GuardrailViolation
+from .ttl_cache import TTLCache
+from ._pool import get_pool
 
 
 def get_db_config() -> dict:
@@ -48,8 +56,85 @@ def create_db_connection() -> "DatabaseConnection":
     )
 
 
+_PLACEHOLDER_RE = re.compile(r"%%|%s")
+
+
+def _isoformat_caster(base):
+    """Wrap a builtin date/time typecaster to return ISO 8601 strings."""
+    def cast(value, cur):
+        parsed = base(value, cur)
+        return parsed.isoformat() if parsed is not None else None
+    return cast
+
+
+# NUMERIC parsed by psycopg2's C float caster: no Decimal or Python frame per value
+_NUMERIC_FLOAT = extensions.new_type(
+    extensions.DECIMAL.values, "NUMERIC_FLOAT", extensions.FLOAT
+)
+
+# OID of numeric[] (pg_type.typarray of numeric)
+_NUMERIC_ARRAY_OID = 1231
+
+# Typecasters registered on every connection so fetched rows are JSON-ready:
+# NUMERIC and NUMERIC[] -> float, DATE -> ISO string (Postgres sends ISO
+# already), TIMESTAMP[TZ] -> ISO string
+_JSON_TYPECASTERS = (
+    _NUMERIC_FLOAT,
+    extensions.new_array_type(
+        (_NUMERIC_ARRAY_OID,), "NUMERIC_FLOAT_ARRAY", _NUMERIC_FLOAT
+    ),
+    extensions.new_type(
+        extensions.DATE.values, "DATE_ISO",
+        lambda value, cur: value
+    ),
+    extensions.new_type(
+        extensions.PYDATETIME.values, "TIMESTAMP_ISO",
+        _isoformat_caster(extensions.PYDATETIME)
+    ),
+    extensions.new_type(
+        extensions.PYDATETIMETZ.values, "TIMESTAMPTZ_ISO",
+        _isoformat_caster(extensions.PYDATETIMETZ)
+    ),
+)
+
+
+# Unique names for server-side (named) cursors
+_CURSOR_IDS = itertools.count()
+
+# Server session state of each pooled connection
+_SESSIONS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class _SessionState:
+    """Prepared statement cache for one server session."""
+
+    def __init__(self):
+        # SQL text -> prepared statement name, oldest first
+        self.prepared: "OrderedDict[str, str]" = OrderedDict()
+        self.deallocate_all = False
+
+
+def _session_state(conn) -> _SessionState:
+    """Get the session state of a connection, initializing it on first use."""
+    state = _SESSIONS.get(conn)
+    if state is None:
+        for caster in _JSON_TYPECASTERS:
+            extensions.register_type(caster, conn)
+        state = _SESSIONS[conn] = _SessionState()
+    return state
+
+
 class DatabaseConnection:
-    """Database connection manager."""
+    """
+    Database connection manager.
+
+    Connections come from a process-wide pool. Each execute_* call borrows
+    one in autocommit mode and returns it afterwards, unless connect() has
+    pinned a transactional connection to this object until close().
+    """
+
+    # Max server-side prepared statements kept per connection
+    PREPARED_CACHE_SIZE = 256
 
     def __init__(
         self,
@@ -73,49 +158,278 @@ class DatabaseConnection:
         self._conn = None
 
     def connect(self):
-        """Establish database connection."""
+        """Pin a pooled connection to this object until close()."""
         if self._conn is None or self._conn.closed:
-            self._conn = psycopg2.connect(**self.config)
+            self.close()
+            conn = get_pool(self.config).getconn()
+            _session_state(conn)
+            conn.autocommit = False
+            self._conn = conn
         return self._conn
 
     def close(self):
-        """Close database connection."""
-        if self._conn and not self._conn.closed:
-            self._conn.close()
+        """Return the pinned connection to the pool."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            get_pool(self.config).putconn(conn)
+
+    @contextmanager
+    def read_only_transaction(self):
+        """
+        Run everything inside one REPEATABLE READ, READ ONLY transaction.
+
+        Pins a pooled connection for the block so all queries share one
+        snapshot and session. The mode rides on psycopg2's own BEGIN, so
+        it costs no extra round-trip. If a connection is already pinned,
+        the caller owns its transaction and the block runs on it unchanged.
+        """
+        if self._conn is not None and not self._conn.closed:
+            yield
+            return
 
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
-        """Execute query and return results as list of dicts."""
         conn = self.connect()
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, params)
-            results = cur.fetchall()
-            # Convert Decimal to float for JSON serialization
-            return [self._convert_row(dict(row)) for row in results]
+        conn.set_session(
+            isolation_level=extensions.ISOLATION_LEVEL_REPEATABLE_READ,
+            readonly=True
+        )
+        try:
+            yield
+        finally:
+            if not conn.closed:
+                conn.rollback()
+                conn.set_session(isolation_level="DEFAULT", readonly="DEFAULT")
+            self.close()
+
+    @contextmanager
+    def _connection(self, autocommit: bool = True):
+        """Use the pinned connection, or borrow one for a single call."""
+        if self._conn is not None and not self._conn.closed:
+            try:
+                yield self._conn
+            except psycopg2.Error:
+                # Leave the pinned connection usable after a failed statement
+                if self._conn.info.transaction_status == extensions.TRANSACTION_STATUS_INERROR:
+                    self._conn.rollback()
+                raise
+            return
+
+        pool = get_pool(self.config)
+        conn = pool.getconn()
+        try:
+            _session_state(conn)
+            conn.autocommit = autocommit
+            yield conn
+        finally:
+            pool.putconn(conn)
+
+    def execute_query(
+        self, query: str, params: tuple = None, prepare: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Execute query and return results as list of dicts."""
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                self._execute(cur, query, params, prepare)
+                # Rows are already JSON-ready via the connection typecasters
+                return [dict(row) for row in cur.fetchall()]
+
+    def execute_query_iter(
+        self, query: str, params: tuple = None, itersize: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream query results as dicts through a server-side cursor.
 
-    def execute_scalar(self, query: str, params: tuple = None) -> Any:
+        Rows are fetched itersize at a time, so peak memory stays bounded
+        for large scans. Prefer execute_query for small aggregate results,
+        which need fewer round-trips.
+        """
+        with self._connection(autocommit=False) as conn:
+            name = f"agent_cur_{next(_CURSOR_IDS)}"
+            with conn.cursor(name=name, cursor_factory=RealDictCursor) as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                for row in cur:
+                    yield dict(row)
+
+    def execute_query_columnar(
+        self, query: str, params: tuple = None, prepare: bool = True
+    ) -> Dict[str, list]:
+        """
+        Execute query and return results as {column: [values...]}.
+
+        Uses a plain tuple cursor and transposes once, avoiding a dict per
+        row. Suited to results that are immediately aggregated by column.
+        """
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                self._execute(cur, query, params, prepare)
+                rows = cur.fetchall()
+                names = [col.name for col in cur.description]
+        if not rows:
+            return {name: [] for name in names}
+        return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+    def execute_scalar(self, query: str, params: tuple = None, prepare: bool = True) -> Any:
         """Execute query and return single value."""
-        conn = self.connect()
-        with conn.cursor() as cur:
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                self._execute(cur, query, params, prepare)
+                result = cur.fetchone()
+                return result[0] if result else None
+
+    def data_version(self) -> Optional[float]:
+        """
+        Total rows written to user tables, per the statistics collector.
+
+        Moves whenever a table or materialized view is loaded, so callers
+        can tell when cached results have gone stale. The session tables
+        the orchestrator writes on every run are left out; no agent reads
+        them, and counting them would invalidate caches after each run.
+        This is a fixed catalog query, so it deliberately skips any
+        subclass guardrails.
+        """
+        return DatabaseConnection.execute_scalar(
+            self,
+            """
+            SELECT SUM(n_tup_ins + n_tup_upd + n_tup_del)
+            FROM pg_stat_user_tables
+            WHERE (schemaname, relname) NOT IN (
+                ('retail', 'decision_session'), ('retail', 'agent_run')
+            )
+            """
+        )
+
+    def _execute(self, cur, query: str, params: Optional[tuple], prepare: bool) -> None:
+        """
+        Run a read query through a server-side prepared statement.
+
+        The first call for a given SQL text sends PREPARE and EXECUTE in one
+        round-trip; later calls only send EXECUTE, so Postgres skips parse
+        and plan. Statements are kept in a per-connection LRU and the oldest
+        is DEALLOCATEd on overflow. Anything that is not a single SELECT/WITH
+        statement runs unprepared.
+        """
+        body = query.strip().rstrip(';').strip()
+        if (not prepare or ';' in body
+                or not body[:6].upper().startswith(('SELECT', 'WITH'))
+                or (params is not None and not isinstance(params, (tuple, list)))):
             cur.execute(query, params)
-            result = cur.fetchone()
-            if result:
-                val = result[0]
-                if isinstance(val, Decimal):
-                    return float(val)
-                return val
-            return None
-
-    def _convert_row(self, row: Dict) -> Dict:
-        """Convert Decimal and date types for JSON serialization."""
-        converted = {}
-        for key, value in row.items():
-            if isinstance(value, Decimal):
-                converted[key] = float(value)
-            elif isinstance(value, (date, datetime)):
-                converted[key] = value.isoformat()
-            else:
-                converted[key] = value
-        return converted
+            return
+
+        state = _session_state(cur.connection)
+        statements = []
+        if state.deallocate_all:
+            statements.append("DEALLOCATE ALL")
+            state.deallocate_all = False
+
+        name = state.prepared.get(query)
+        if name is not None:
+            state.prepared.move_to_end(query)
+        else:
+            name = "ps_" + hashlib.md5(query.encode()).hexdigest()[:16]
+            if len(state.prepared) >= self.PREPARED_CACHE_SIZE:
+                _, evicted = state.prepared.popitem(last=False)
+                statements.append(f"DEALLOCATE {evicted}")
+            if params:
+                counter = iter(range(1, len(params) + 1))
+                body = _PLACEHOLDER_RE.sub(
+                    lambda m: m.group() if m.group() == "%%" else f"${next(counter)}",
+                    body
+                )
+            statements.append(f"PREPARE {name} AS {body}")
+            state.prepared[query] = name
+
+        if params:
+            statements.append(f"EXECUTE {name}({', '.join(['%s'] * len(params))})")
+        else:
+            statements.append(f"EXECUTE {name}")
+
+        try:
+            cur.execute(";\n".join(statements), params or None)
+        except psycopg2.Error:
+            # Server state of the cache is unknown after a failure; start over
+            state.prepared.clear()
+            state.deallocate_all = True
+            raise
+
+    def execute_many_queries(
+        self, queries: List[Tuple[str, Optional[tuple]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Execute independent read queries in a single round-trip.
+
+        Each query is aggregated into a JSON array by one batch SELECT, so
+        N queries cost one network round-trip instead of N. The batch keeps
+        its placeholders and runs as a prepared statement, so repeat calls
+        with new dates reuse the plan. Results are returned as row lists in
+        input order.
+        """
+        if not queries:
+            return []
+        with self._connection() as conn:
+            with conn.cursor() as cur:
+                columns = []
+                args = []
+                # Named (dict) params can't share one positional statement
+                bind = any(isinstance(params, dict) for _, params in queries)
+                has_args = any(params for _, params in queries)
+                for i, (query, params) in enumerate(queries):
+                    body = query.strip().rstrip(';')
+                    if bind:
+                        body = cur.mogrify(body, params).decode()
+                    elif params:
+                        args.extend(params)
+                    elif has_args:
+                        # Unparameterized SQL must escape % for the shared call
+                        body = body.replace('%', '%%')
+                    columns.append(
+                        f"(SELECT COALESCE(json_agg(q), '[]'::json) FROM ({body}\n) q) AS r{i}"
+                    )
+                batch = "SELECT " + ",\n".join(columns)
+                if bind:
+                    cur.execute(batch)
+                else:
+                    self._execute(cur, batch, tuple(args) or None, prepare=True)
+                row = cur.fetchone()
+        return [list(rows) for rows in row]
+
+    def execute_write(self, query: str, params: tuple = None) -> None:
+        """
+        Execute a single write statement and commit.
+
+        Borrows a pooled connection for the call unless one is pinned, so
+        writers never hold a pool slot past the statement.
+        """
+        with self._connection(autocommit=False) as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+            conn.commit()
+
+    def execute_batch(self, query: str, args_iter, page_size: int = 100) -> None:
+        """
+        Execute a write statement for many parameter tuples and commit.
+
+        Sends page_size statements per round-trip. Use this (or
+        execute_values for INSERTs) instead of cursor.executemany, which
+        costs one round-trip per row.
+        """
+        with self._connection(autocommit=False) as conn:
+            with conn.cursor() as cur:
+                execute_batch(cur, query, args_iter, page_size=page_size)
+            conn.commit()
+
+    def execute_values(
+        self, query: str, rows, template: str = None, page_size: int = 100
+    ) -> None:
+        """
+        Bulk insert rows with a single multi-row VALUES list and commit.
+
+        The query must contain one %s placeholder where the VALUES list goes,
+        e.g. "INSERT INTO t (a, b) VALUES %s".
+        """
+        with self._connection(autocommit=False) as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, query, rows, template=template, page_size=page_size)
+            conn.commit()
 
     def __enter__(self):
         self.connect()
@@ -124,6 +438,18 @@ class DatabaseConnection:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    def __del__(self):
+        # Don't leak a pinned connection if close() was never called
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# Read results of guardrailed queries, keyed by database + user + SQL + params;
+# see BaseAgent.invalidate()
+_QUERY_CACHE = TTLCache(maxsize=512, ttl=300)
+
 
 class GuardrailedDatabaseConnection(DatabaseConnection):
     """
@@ -131,8 +457,15 @@ class GuardrailedDatabaseConnection(DatabaseConnection):
 
     Validates all queries against role-based rules before execution.
     Provides defense-in-depth alongside database-level permissions.
+
+    Since guardrails only admit reads, row results of execute_query and
+    execute_many_queries are also memoized for a few minutes, so repeated
+    analyses of the same period skip the database.
     """
 
+    # Max accepted SQL texts remembered per connection
+    VALIDATED_CACHE_SIZE = 512
+
     def __init__(
         self,
         role: str,
@@ -149,37 +482,117 @@ class GuardrailedDatabaseConnection(DatabaseConnection):
         self.enforce_guardrails = enforce_guardrails
         self._guardrails = SQLGuardrails(role) if enforce_guardrails else None
         self._violation_log: List[Dict] = []
+        # SQL texts that already passed validation
+        self._validated: set = set()
 
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        # Statement timeout and memory settings are applied once per
+        # session at connect time, so the server enforces them
+        if self._guardrails:
+            timeout_ms = int(self._guardrails.get_timeout() * 1000)
+            options = [f"-c statement_timeout={timeout_ms}"]
+            work_mem = self._guardrails.get_work_mem()
+            if work_mem:
+                options.append(f"-c work_mem={work_mem}")
+            self.config["options"] = " ".join(options)
+
+    def execute_query(
+        self, query: str, params: tuple = None, prepare: bool = True
+    ) -> List[Dict[str, Any]]:
         """Execute query with guardrail enforcement."""
         if self.enforce_guardrails and self._guardrails:
-            # Validate query
-            is_valid, error = self._guardrails.validate(query)
-            if not is_valid:
-                self._log_violation(query, error)
-                raise GuardrailViolation(error)
+            # The row-limit rewrite is deterministic, so the limited SQL
+            # is just as stable a prepared-statement key as the original
+            query = self._check_query(query)
+
+        _check_data_version(self)
+        key = self._cache_key(query, params)
+        rows = _QUERY_CACHE.get(key)
+        if rows is None:
+            rows = super().execute_query(query, params, prepare)
+            _QUERY_CACHE.set(key, rows)
+        return [dict(row) for row in rows]
+
+    def execute_query_iter(
+        self, query: str, params: tuple = None, itersize: int = 2000
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream query results with guardrail enforcement."""
+        if self.enforce_guardrails and self._guardrails:
+            query = self._check_query(query)
 
-            # Apply row limit
-            query = self._guardrails.wrap_with_limit(query)
+        return super().execute_query_iter(query, params, itersize)
 
-        # Set statement timeout for this query
-        conn = self.connect()
+    def execute_query_columnar(
+        self, query: str, params: tuple = None, prepare: bool = True
+    ) -> Dict[str, list]:
+        """Execute columnar query with guardrail enforcement."""
         if self.enforce_guardrails and self._guardrails:
-            timeout_ms = int(self._guardrails.get_timeout() * 1000)
-            with conn.cursor() as cur:
-                cur.execute(f"SET statement_timeout = {timeout_ms}")
+            query = self._check_query(query)
+
+        return super().execute_query_columnar(query, params, prepare)
+
+    def execute_many_queries(
+        self, queries: List[Tuple[str, Optional[tuple]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Execute a query batch with guardrail enforcement on every query."""
+        if self.enforce_guardrails and self._guardrails:
+            queries = [(self._check_query(query), params) for query, params in queries]
+
+        _check_data_version(self)
+        keys = [self._cache_key(query, params) for query, params in queries]
+        results = [_QUERY_CACHE.get(key) for key in keys]
+        missing = [i for i, rows in enumerate(results) if rows is None]
+        if missing:
+            fetched = super().execute_many_queries([queries[i] for i in missing])
+            for i, rows in zip(missing, fetched):
+                _QUERY_CACHE.set(keys[i], rows)
+                results[i] = rows
+        return [[dict(row) for row in rows] for rows in results]
+
+    def _cache_key(self, query: str, params) -> tuple:
+        """
+        Result-cache key for a query on this database.
 
-        return super().execute_query(query, params)
+        Keys start with (host, port, database) so a data change on one
+        database can drop just that database's entries.
+        """
+        # Include the user: roles with different grants must not share rows
+        scope = (
+            self.config.get("host"), self.config.get("port"),
+            self.config.get("database"), self.config.get("user")
+        )
+        return scope + (hashlib.sha1(repr((query, params)).encode()).hexdigest(),)
+
+    def _validate(self, query: str) -> None:
+        """
+        Validate a query, raising GuardrailViolation if it is rejected.
 
-    def execute_scalar(self, query: str, params: tuple = None) -> Any:
+        Accepted SQL texts are remembered, so the sqlparse pass runs once
+        per distinct query rather than on every call. Rejections are
+        re-checked and logged every time.
+        """
+        if query in self._validated:
+            return
+
+        is_valid, error = self._guardrails.validate(query)
+        if not is_valid:
+            self._log_violation(query, error)
+            raise GuardrailViolation(error)
+
+        if len(self._validated) >= self.VALIDATED_CACHE_SIZE:
+            self._validated.clear()
+        self._validated.add(query)
+
+    def _check_query(self, query: str) -> str:
+        """Validate a query and apply the role's row limit."""
+        self._validate(query)
+        return self._guardrails.wrap_with_limit(query)
+
+    def execute_scalar(self, query: str, params: tuple = None, prepare: bool = True) -> Any:
         """Execute scalar query with guardrail enforcement."""
         if self.enforce_guardrails and self._guardrails:
-            is_valid, error = self._guardrails.validate(query)
-            if not is_valid:
-                self._log_violation(query, error)
-                raise GuardrailViolation(error)
+            self._validate(query)
 
-        return super().execute_scalar(query, params)
+        return super().execute_scalar(query, params, prepare)
 
     def _log_violation(self, query: str, error: str) -> None:
         """Log guardrail violation for audit."""
@@ -198,6 +611,63 @@ class GuardrailedDatabaseConnection(DatabaseConnection):
         return self._guardrails
 
 
+# run() results per (database, user, agent, role, date range); see
+# BaseAgent.invalidate()
+_RUN_CACHE = TTLCache(maxsize=256, ttl=300)
+
+# Available sales date range per database
+_DATE_RANGE_CACHE = TTLCache(maxsize=16, ttl=60)
+
+# Whether optional objects from performance_schema.sql exist, per
+# (database, feature); re-probed once an entry expires
+_FEATURE_CACHE = TTLCache(maxsize=64, ttl=300)
+
+# Data version per database: recently polled values, and the last one seen
+_DATA_VERSION_CACHE = TTLCache(maxsize=16, ttl=60)
+_DATA_VERSIONS: Dict[tuple, Any] = {}
+
+
+def _check_data_version(db) -> None:
+    """
+    Invalidate cached results for db's database if it reports new writes.
+
+    Polled at most once a minute per database. Called from run() and from
+    every cached guardrailed read, so analyze() callers see fresh data too.
+    """
+    data_version = getattr(db, 'data_version', None)
+    if data_version is None:
+        return
+    key = _database_key(db)
+    if _DATA_VERSION_CACHE.get(key) is not None:
+        return
+
+    try:
+        version = data_version()
+    except psycopg2.Error:
+        return
+    _DATA_VERSION_CACHE.set(key, (version,))
+    if _DATA_VERSIONS.setdefault(key, version) != version:
+        _DATA_VERSIONS[key] = version
+        _invalidate_database(key)
+
+
+def _database_key(db) -> tuple:
+    """(host, port, database) that db connects to; prefixes per-database cache keys."""
+    config = getattr(db, 'config', {})
+    return (config.get('host'), config.get('port'), config.get('database'))
+
+
+def _invalidate_database(key: tuple) -> None:
+    """Drop cached results for one (host, port, database); others are kept."""
+    def on_database(cache_key) -> bool:
+        return cache_key[:3] == key
+
+    _RUN_CACHE.clear_matching(on_database)
+    _QUERY_CACHE.clear_matching(on_database)
+    _DATE_RANGE_CACHE.clear_matching(on_database)
+    _FEATURE_CACHE.clear_matching(on_database)
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for all boardroom agents.
@@ -237,7 +707,9 @@ class BaseAgent(ABC):
         else:
             self.db = DatabaseConnection()
 
-        self._evidence: List[Evidence] = []
+        # (view, filters, query_id) tuples; Evidence objects are built once
+        # when the output is assembled
+        self._evidence_raw: List[tuple] = []
 
     def _get_role_name(self) -> str:
         """Get role name for guardrails. Override if role property not yet available."""
@@ -265,13 +737,49 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def analyze_async(self, date_from: str = None, date_to: str = None) -> AgentOutput:
+        """
+        Async variant of analyze() for use inside an event loop.
+
+        Runs analyze() in one worker thread. Agents batch their queries
+        into a single round-trip, so fanning them out across threads would
+        only take more pooled connections.
+        """
+        return await asyncio.to_thread(self.analyze, date_from, date_to)
+
     def _add_evidence(self, view: str, filters: str, query_id: str = None):
         """Track evidence for transparency."""
-        self._evidence.append(Evidence(view=view, filters=filters, query_id=query_id))
+        self._evidence_raw.append((view, filters, query_id))
+
+    @property
+    def _evidence(self) -> List[Evidence]:
+        """Evidence tracked so far in this analysis run."""
+        return [Evidence(view, filters, query_id) for view, filters, query_id in self._evidence_raw]
 
     def _clear_evidence(self):
         """Clear evidence for new analysis run."""
-        self._evidence = []
+        self._evidence_raw = []
+
+    def _feature_available(self, feature: str) -> Optional[bool]:
+        """Whether an optional database object exists here; None until probed."""
+        return _FEATURE_CACHE.get(_database_key(self.db) + (feature,))
+
+    def _set_feature_available(self, feature: str, available: bool) -> None:
+        """Record a probe result, shared by every agent on this database."""
+        _FEATURE_CACHE.set(_database_key(self.db) + (feature,), available)
+
+    def _clamp_limit(self, limit: int) -> int:
+        """
+        Cap a bound LIMIT at the role's max_rows.
+
+        wrap_with_limit() leaves queries that already have a LIMIT alone,
+        so a parameterized LIMIT has to be clamped before it is bound.
+        """
+        get_guardrails = getattr(self.db, 'get_guardrails', None)
+        guardrails = get_guardrails() if get_guardrails else None
+        if guardrails is None:
+            return int(limit)
+        return min(int(limit), guardrails.get_max_rows())
 
     def _calculate_trend(self, current: float, previous: float) -> Trend:
         """Calculate trend based on current vs previous values."""
@@ -284,6 +792,22 @@ class BaseAgent(ABC):
             return Trend.DOWN
         return Trend.FLAT
 
+    def _calculate_trend_batch(self, current: List[float], previous: List[float]) -> List[Trend]:
+        """
+        Calculate trends for parallel lists of current/previous values.
+
+        Same ±1% rule as _calculate_trend, evaluated in one comprehension
+        without a method call per pair.
+        """
+        up, down, flat = Trend.UP, Trend.DOWN, Trend.FLAT
+        return [
+            flat if prev == 0
+            else up if (cur - prev) * 100 > abs(prev)
+            else down if (cur - prev) * 100 < -abs(prev)
+            else flat
+            for cur, prev in zip(current, previous)
+        ]
+
     def _format_currency(self, value: float) -> str:
         """Format value as currency string."""
         if value >= 1_000_000:
@@ -292,6 +816,15 @@ class BaseAgent(ABC):
             return f"${value/1_000:.1f}K"
         return f"${value:.2f}"
 
+    def _format_currency_batch(self, values: List[float]) -> List[str]:
+        """Format a list of values as currency strings."""
+        return [
+            f"${v/1_000_000:.2f}M" if v >= 1_000_000
+            else f"${v/1_000:.1f}K" if v >= 1_000
+            else f"${v:.2f}"
+            for v in values
+        ]
+
     def _format_percentage(self, value: float) -> str:
         """Format value as percentage string."""
         return f"{value:.1f}%"
@@ -300,6 +833,10 @@ class BaseAgent(ABC):
         """
         Run analysis and return JSON output.
 
+        Results are cached per database, agent and date range for a few
+        minutes, so repeated dashboard requests skip the database entirely.
+        Caches are dropped early once the database reports new writes.
+
         Args:
             date_from: Start date for analysis
             date_to: End date for analysis
@@ -307,8 +844,47 @@ class BaseAgent(ABC):
         Returns:
             JSON string conforming to agent interface contract
         """
+        self._check_data_version()
+        config = getattr(self.db, 'config', {})
+        key = (
+            config.get('host'), config.get('port'), config.get('database'), config.get('user'),
+            type(self).__name__, self._get_role_name(), date_from, date_to
+        )
+        cached = _RUN_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._run_uncached(date_from, date_to)
+        _RUN_CACHE.set(key, result)
+        return result
+
+    def analyze_cached(self, date_from: str = None, date_to: str = None) -> AgentOutput:
+        """
+        analyze() through run()'s cache, for callers that want the object.
+
+        Each call returns a fresh AgentOutput parsed from the cached JSON,
+        so callers may mutate it without affecting later hits.
+        """
+        return AgentOutput.from_json(self.run(date_from, date_to))
+
+    async def analyze_cached_async(self, date_from: str = None, date_to: str = None) -> AgentOutput:
+        """Async variant of analyze_cached(); the lookup runs in a worker thread."""
+        return AgentOutput.from_json(await self.run_async(date_from, date_to))
+
+    async def run_async(self, date_from: str = None, date_to: str = None) -> str:
+        """
+        Async variant of run() for use inside an event loop.
+
+        Shares run()'s cache; the cache check and any analysis run in a
+        worker thread so the loop is never blocked on the database.
+        """
+        return await asyncio.to_thread(self.run, date_from, date_to)
+
+    def _run_uncached(self, date_from: str = None, date_to: str = None) -> str:
+        """Run analysis against the database and return JSON output."""
         self._clear_evidence()
-        output = self.analyze(date_from, date_to)
+        with self.db.read_only_transaction():
+            output = self.analyze(date_from, date_to)
 
         # Validate output
         errors = validate_agent_output(output)
@@ -317,15 +893,39 @@ class BaseAgent(ABC):
 
         return output.to_json()
 
+    @staticmethod
+    def invalidate() -> None:
+        """Drop cached run() results, query results, date ranges and feature probes (call after data loads/ETL)."""
+        _RUN_CACHE.clear()
+        _QUERY_CACHE.clear()
+        _DATE_RANGE_CACHE.clear()
+        _FEATURE_CACHE.clear()
+
+    def _check_data_version(self) -> None:
+        """Invalidate cached results if the data has changed (polled once a minute)."""
+        _check_data_version(self.db)
+
     def get_date_range(self) -> tuple:
-        """Get the date range of available data."""
+        """Get the date range of available data (cached for a minute)."""
+        key = _database_key(self.db)
+        cached = _DATE_RANGE_CACHE.get(key)
+        if cached is None:
+            cached = self._query_date_range()
+            if cached[0] is not None:
+                _DATE_RANGE_CACHE.set(key, cached)
+        return cached
+
+    def _query_date_range(self) -> tuple:
+        """Query MIN/MAX sale date of available data."""
         query = """
         SELECT
             MIN(sale_date) as min_date,
             MAX(sale_date) as max_date
         FROM retail.v_sales_daily_store_category
         """
-        result = self.db.execute_query(query)
-        if result:
-            return result[0]['min_date'], result[0]['max_date']
+        # Columnar reads bypass the query cache, so the shorter
+        # _DATE_RANGE_CACHE TTL governs how fresh this is
+        result = self.db.execute_query_columnar(query)
+        if result.get('min_date'):
+            return result['min_date'][0], result['max_date'][0]
         return None, None
@@ -5,12 +5,104 @@ Chief Executive Officer - Focus on strategic overview, cross-functional synthesi
 """
 
 from typing import Optional, List
+import psycopg2
 from .base_agent import BaseAgent, DatabaseConnection
 from .contract import (
     AgentOutput, AgentRole, KPI, Recommendation, Evidence,
     Trend, Confidence
 )
 
+# All analyze() metrics in one call (see performance_schema.sql)
+_SQL_CEO_SNAPSHOT = "SELECT retail.fn_ceo_snapshot(%s, %s)"
+
+# Executive summary metrics
+_SQL_BOARD_SUMMARY = """
+SELECT
+    period_start,
+    period_end,
+    net_revenue,
+    units_sold
+FROM retail.v_board_summary
+"""
+
+# Margin totals plus first/last month margin %, one scan
+_SQL_MARGIN = """
+WITH monthly AS (
+    SELECT
+        DATE_TRUNC('month', sale_date) as month,
+        SUM(gross_revenue) as revenue,
+        SUM(cogs) as cogs,
+        SUM(gross_margin) as margin
+    FROM retail.v_margin_daily_store_sku
+    WHERE sale_date BETWEEN %s AND %s
+    GROUP BY DATE_TRUNC('month', sale_date)
+)
+SELECT
+    SUM(revenue) as total_revenue,
+    SUM(cogs) as total_cogs,
+    SUM(margin) as total_margin,
+    CASE
+        WHEN SUM(revenue) > 0
+        THEN (SUM(margin) / SUM(revenue) * 100)
+        ELSE 0
+    END as margin_pct,
+    (ARRAY_AGG(margin/NULLIF(revenue,0)*100 ORDER BY month))[1] as first_month,
+    (ARRAY_AGG(margin/NULLIF(revenue,0)*100 ORDER BY month DESC))[1] as last_month
+FROM monthly
+"""
+
+# Store performance summary
+_SQL_STORE_PERF = """
+SELECT
+    COUNT(DISTINCT store_id) as active_stores,
+    SUM(net_revenue) as total_revenue,
+    SUM(net_revenue) / NULLIF(COUNT(DISTINCT store_id), 0) as avg_revenue_per_store,
+    SUM(units_sold) as total_units
+FROM retail.v_sales_daily_store_category
+WHERE sale_date BETWEEN %s AND %s
+"""
+
+# Category and region totals via GROUPING SETS
+_SQL_CATEGORY_REGION = """
+SELECT
+    CASE WHEN GROUPING(v.category_name) = 0 THEN 'category' ELSE 'region' END as dim,
+    v.category_name,
+    s.region,
+    COUNT(DISTINCT s.store_id) as stores,
+    SUM(v.net_revenue) as revenue,
+    SUM(v.units_sold) as units
+FROM retail.v_sales_daily_store_category v
+LEFT JOIN retail.dim_store s ON s.store_id = v.store_id
+WHERE v.sale_date BETWEEN %s AND %s
+GROUP BY GROUPING SETS ((v.category_name), (s.region))
+ORDER BY revenue DESC
+"""
+
+# Units sold vs returned from one UNION ALL scan
+_SQL_RETURNS = """
+WITH totals AS (
+    SELECT
+        COALESCE(SUM(qty) FILTER (WHERE src = 'S'), 0) as total_sold,
+        COALESCE(SUM(qty) FILTER (WHERE src = 'R'), 0) as total_returned
+    FROM (
+        SELECT qty, 'S' as src FROM retail.fact_sales_line
+        WHERE sale_date BETWEEN %s AND %s
+        UNION ALL
+        SELECT qty, 'R' as src FROM retail.fact_returns_line
+        WHERE return_date BETWEEN %s AND %s
+    ) t
+)
+SELECT
+    total_returned,
+    total_sold,
+    CASE
+        WHEN total_sold > 0
+        THEN (total_returned::float / total_sold * 100)
+        ELSE 0
+    END as return_rate
+FROM totals
+"""
+
 
 class CEOAgent(BaseAgent):
     """
@@ -22,6 +114,11 @@ class CEOAgent(BaseAgent):
     - Board-ready insights
     """
 
+    # Keys of retail.fn_ceo_snapshot, in analyze() query order
+    SNAPSHOT_KEYS = (
+        'board', 'margin', 'stores', 'categories_regions', 'returns',
+    )
+
     @property
     def role(self) -> AgentRole:
         return AgentRole.CEO
@@ -33,13 +130,42 @@ class CEOAgent(BaseAgent):
         if not date_from or not date_to:
             date_from, date_to = self.get_date_range()
 
+        # Fetch all independent metrics in a single round-trip
+        queries = self._analysis_queries(date_from, date_to)
+        snapshot = self._get_ceo_snapshot(date_from, date_to)
+        if snapshot is not None:
+            results = [snapshot.get(key) or [] for key in self.SNAPSHOT_KEYS]
+        else:
+            results = self.db.execute_many_queries(queries)
+
+        return self._build_output(date_from, date_to, results)
+
+    def _analysis_queries(self, date_from: str, date_to: str) -> list:
+        """All (sql, params) pairs analyze() needs, in SNAPSHOT_KEYS order."""
+        return [
+            self._board_summary_query(),
+            self._margin_query(date_from, date_to),
+            self._store_performance_query(date_from, date_to),
+            self._category_region_query(date_from, date_to),
+            self._return_summary_query(date_from, date_to),
+        ]
+
+    def _build_output(self, date_from: str, date_to: str, results: list) -> AgentOutput:
+        """Assemble the CEO output from the fetched metric rows."""
         window = f"{date_from} to {date_to}"
 
+        (board_rows, margin_rows, store_rows,
+         category_region_rows, return_rows) = results
+        board_summary = self._parse_board_summary(board_rows)
+        margin_data = self._parse_margin_summary(margin_rows)
+        store_data = self._parse_store_performance(store_rows)
+        return_data = self._parse_return_summary(return_rows)
+        category_rows, region_rows = self._parse_category_region(category_region_rows)
+
         # Calculate strategic KPIs
         kpis = []
 
         # 1. Net Revenue (primary metric)
-        board_summary = self._get_board_summary()
         kpis.append(KPI(
             name="Net Revenue",
             value=round(board_summary['net_revenue'], 2),
@@ -49,12 +175,11 @@ class CEOAgent(BaseAgent):
         ))
 
         # 2. Gross Margin %
-        margin_data = self._get_margin_summary(date_from, date_to)
         kpis.append(KPI(
             name="Gross Margin",
             value=round(margin_data['margin_pct'], 1),
             unit="%",
-            trend=self._get_margin_trend(date_from, date_to),
+            trend=self._parse_margin_trend(margin_rows),
             window=window
         ))
 
@@ -68,7 +193,6 @@ class CEOAgent(BaseAgent):
         ))
 
         # 4. Store Performance
-        store_data = self._get_store_performance_summary(date_from, date_to)
         kpis.append(KPI(
             name="Avg Revenue/Store",
             value=round(store_data['avg_revenue_per_store'], 2),
@@ -79,11 +203,11 @@ class CEOAgent(BaseAgent):
 
         # Generate strategic insights
         insights = self._generate_strategic_insights(
-            board_summary, margin_data, store_data, date_from, date_to
+            board_summary, margin_data, store_data, category_rows
         )
 
         # Synthesize cross-functional risks
-        risks = self._synthesize_risks(margin_data, store_data, date_from, date_to)
+        risks = self._synthesize_risks(margin_data, region_rows, return_data)
 
         # Generate strategic recommendations
         recommendations = self._generate_strategic_recommendations(
@@ -100,94 +224,101 @@ class CEOAgent(BaseAgent):
             confidence=Confidence.HIGH
         )
 
+    @property
+    def _snapshot_available(self) -> Optional[bool]:
+        """Whether retail.fn_ceo_snapshot exists; None until first tried."""
+        return self._feature_available('retail.fn_ceo_snapshot')
+
+    def _get_ceo_snapshot(self, date_from: str, date_to: str) -> Optional[dict]:
+        """
+        Get all analyze() metrics from retail.fn_ceo_snapshot.
+
+        Returns None when the function is not installed (see
+        performance_schema.sql) so callers can fall back to the query batch.
+        """
+        if self._snapshot_available is False:
+            return None
+        try:
+            snapshot = self.db.execute_scalar(_SQL_CEO_SNAPSHOT, (date_from, date_to))
+        except psycopg2.errors.UndefinedFunction:
+            self._set_feature_available('retail.fn_ceo_snapshot', False)
+            return None
+        self._set_feature_available('retail.fn_ceo_snapshot', True)
+        return snapshot
+
     def _get_board_summary(self) -> dict:
         """Get high-level board summary metrics."""
-        query = """
-        SELECT
-            period_start,
-            period_end,
-            net_revenue,
-            units_sold
-        FROM retail.v_board_summary
-        """
+        return self._parse_board_summary(
+            self.db.execute_query(*self._board_summary_query())
+        )
+
+    def _board_summary_query(self) -> tuple:
         self._add_evidence("retail.v_board_summary", "executive summary metrics")
-        result = self.db.execute_query(query)
+        return _SQL_BOARD_SUMMARY, None
+
+    def _parse_board_summary(self, result: list) -> dict:
         if result:
             return {
                 'period_start': result[0]['period_start'],
                 'period_end': result[0]['period_end'],
                 'net_revenue': result[0]['net_revenue'] or 0,
-                'units_sold': result[0]['units_sold'] or 0
+                'units_sold': result[0]['units_sold'] or 0,
+                # Pre-formatted by fn_ceo_snapshot; absent on the query path
+                'revenue_fmt': result[0].get('revenue_fmt'),
+                'units_fmt': result[0].get('units_fmt')
             }
         return {'net_revenue': 0, 'units_sold': 0}
 
     def _get_margin_summary(self, date_from: str, date_to: str) -> dict:
         """Get margin summary for executive view."""
-        query = """
-        SELECT
-            SUM(gross_revenue) as total_revenue,
-            SUM(cogs) as total_cogs,
-            SUM(gross_margin) as total_margin,
-            CASE
-                WHEN SUM(gross_revenue) > 0
-                THEN (SUM(gross_margin) / SUM(gross_revenue) * 100)
-                ELSE 0
-            END as margin_pct
-        FROM retail.v_margin_daily_store_sku
-        WHERE sale_date BETWEEN %s AND %s
-        """
+        return self._parse_margin_summary(
+            self.db.execute_query(*self._margin_query(date_from, date_to))
+        )
+
+    def _get_margin_trend(self, date_from: str, date_to: str) -> Trend:
+        """Calculate margin trend over the period."""
+        return self._parse_margin_trend(
+            self.db.execute_query(*self._margin_query(date_from, date_to))
+        )
+
+    def _margin_query(self, date_from: str, date_to: str) -> tuple:
+        """Margin totals and first/last month margin % in one scan."""
         self._add_evidence(
             "retail.v_margin_daily_store_sku",
             f"sale_date between '{date_from}' and '{date_to}'"
         )
-        result = self.db.execute_query(query, (date_from, date_to))
+        return _SQL_MARGIN, (date_from, date_to)
+
+    def _parse_margin_summary(self, result: list) -> dict:
         if result:
             return {
                 'total_revenue': result[0]['total_revenue'] or 0,
                 'total_cogs': result[0]['total_cogs'] or 0,
                 'total_margin': result[0]['total_margin'] or 0,
-                'margin_pct': result[0]['margin_pct'] or 0
+                'margin_pct': result[0]['margin_pct'] or 0,
+                'margin_fmt': result[0].get('margin_fmt')
             }
         return {'total_revenue': 0, 'total_cogs': 0, 'total_margin': 0, 'margin_pct': 0}
 
-    def _get_margin_trend(self, date_from: str, date_to: str) -> Trend:
-        """Calculate margin trend over the period."""
-        query = """
-        WITH monthly AS (
-            SELECT
-                DATE_TRUNC('month', sale_date) as month,
-                SUM(gross_revenue) as revenue,
-                SUM(gross_margin) as margin
-            FROM retail.v_margin_daily_store_sku
-            WHERE sale_date BETWEEN %s AND %s
-            GROUP BY DATE_TRUNC('month', sale_date)
-            ORDER BY month
-        )
-        SELECT
-            (SELECT margin/NULLIF(revenue,0)*100 FROM monthly ORDER BY month LIMIT 1) as first_month,
-            (SELECT margin/NULLIF(revenue,0)*100 FROM monthly ORDER BY month DESC LIMIT 1) as last_month
-        """
-        result = self.db.execute_query(query, (date_from, date_to))
+    def _parse_margin_trend(self, result: list) -> Trend:
         if result and result[0]['first_month'] and result[0]['last_month']:
             return self._calculate_trend(result[0]['last_month'], result[0]['first_month'])
         return Trend.FLAT
 
     def _get_store_performance_summary(self, date_from: str, date_to: str) -> dict:
         """Get store performance summary."""
-        query = """
-        SELECT
-            COUNT(DISTINCT store_id) as active_stores,
-            SUM(net_revenue) as total_revenue,
-            SUM(net_revenue) / NULLIF(COUNT(DISTINCT store_id), 0) as avg_revenue_per_store,
-            SUM(units_sold) as total_units
-        FROM retail.v_sales_daily_store_category
-        WHERE sale_date BETWEEN %s AND %s
-        """
+        return self._parse_store_performance(
+            self.db.execute_query(*self._store_performance_query(date_from, date_to))
+        )
+
+    def _store_performance_query(self, date_from: str, date_to: str) -> tuple:
         self._add_evidence(
             "retail.v_sales_daily_store_category",
             f"sale_date between '{date_from}' and '{date_to}'"
         )
-        result = self.db.execute_query(query, (date_from, date_to))
+        return _SQL_STORE_PERF, (date_from, date_to)
+
+    def _parse_store_performance(self, result: list) -> dict:
         if result:
             return {
                 'active_stores': result[0]['active_stores'] or 0,
@@ -199,75 +330,81 @@ class CEOAgent(BaseAgent):
 
     def _get_top_categories(self, date_from: str, date_to: str, limit: int = 3) -> list:
         """Get top performing categories."""
-        query = """
-        SELECT
-            category_name,
-            SUM(net_revenue) as revenue,
-            SUM(units_sold) as units
-        FROM retail.v_sales_daily_store_category
-        WHERE sale_date BETWEEN %s AND %s
-        GROUP BY category_name
-        ORDER BY revenue DESC
-        LIMIT %s
-        """
+        rows = self.db.execute_query(*self._category_region_query(date_from, date_to))
+        return self._parse_category_region(rows, limit)[0]
+
+    def _get_regional_performance(self, date_from: str, date_to: str) -> dict:
+        """Get performance by region, as columns ordered by revenue."""
+        rows = self.db.execute_query_iter(*self._category_region_query(date_from, date_to))
+        return self._parse_category_region(rows)[1]
+
+    def _category_region_query(self, date_from: str, date_to: str, limit: int = 3) -> tuple:
+        """Category and region totals from one scan via GROUPING SETS."""
         self._add_evidence(
             "retail.v_sales_daily_store_category",
             f"top {limit} categories by revenue"
         )
-        return self.db.execute_query(query, (date_from, date_to, limit))
-
-    def _get_regional_performance(self, date_from: str, date_to: str) -> list:
-        """Get performance by region."""
-        query = """
-        SELECT
-            s.region,
-            COUNT(DISTINCT s.store_id) as stores,
-            SUM(v.net_revenue) as revenue,
-            SUM(v.units_sold) as units
-        FROM retail.v_sales_daily_store_category v
-        JOIN retail.dim_store s ON s.store_id = v.store_id
-        WHERE v.sale_date BETWEEN %s AND %s
-        GROUP BY s.region
-        ORDER BY revenue DESC
-        """
         self._add_evidence(
             "retail.v_sales_daily_store_category + retail.dim_store",
             f"regional performance"
         )
-        return self.db.execute_query(query, (date_from, date_to))
+        return _SQL_CATEGORY_REGION, (date_from, date_to)
+
+    def _parse_category_region(self, rows: list, limit: int = 3) -> tuple:
+        """
+        Split grouping-set rows into (top categories, regions), both by revenue.
+
+        Regions are returned columnar ({column: [values...]}) since callers
+        aggregate over them.
+        """
+        categories = []
+        regions = {'region': [], 'stores': [], 'revenue': [], 'units': []}
+        for row in rows:
+            if row['dim'] == 'category':
+                if len(categories) < limit:
+                    categories.append({
+                        'category_name': row['category_name'],
+                        'revenue': row['revenue'],
+                        'units': row['units'],
+                    })
+            elif row['region'] is not None:
+                regions['region'].append(row['region'])
+                regions['stores'].append(row['stores'])
+                regions['revenue'].append(row['revenue'] or 0)
+                regions['units'].append(row['units'])
+        return categories, regions
 
     def _generate_strategic_insights(
         self,
         board_summary: dict,
         margin_data: dict,
         store_data: dict,
-        date_from: str,
-        date_to: str
+        top_categories: list
     ) -> list:
         """Generate CEO-level strategic insights."""
         insights = []
 
         # Revenue and volume headline
-        revenue = board_summary.get('net_revenue', 0)
-        units = board_summary.get('units_sold', 0)
+        revenue = board_summary.get('revenue_fmt') or f"{board_summary.get('net_revenue', 0):,.0f}"
+        units = board_summary.get('units_fmt') or f"{board_summary.get('units_sold', 0):,}"
         insights.append(
-            f"Total revenue of ${revenue:,.0f} from {units:,} units sold "
+            f"Total revenue of ${revenue} from {units} units sold "
             f"across {store_data.get('active_stores', 0)} stores."
         )
 
         # Margin insight
         margin_pct = margin_data.get('margin_pct', 0)
+        margin_fmt = margin_data.get('margin_fmt') or f"{margin_pct:.1f}"
         if margin_pct >= 20:
             insights.append(
-                f"Healthy gross margin of {margin_pct:.1f}% indicates strong pricing power."
+                f"Healthy gross margin of {margin_fmt}% indicates strong pricing power."
             )
         else:
             insights.append(
-                f"Gross margin at {margin_pct:.1f}% - below 20% target requires attention."
+                f"Gross margin at {margin_fmt}% - below 20% target requires attention."
             )
 
         # Top categories
-        top_categories = self._get_top_categories(date_from, date_to)
         if top_categories:
             cat_names = [c['category_name'] for c in top_categories[:3]]
             insights.append(
@@ -279,40 +416,39 @@ class CEOAgent(BaseAgent):
     def _synthesize_risks(
         self,
         margin_data: dict,
-        store_data: dict,
-        date_from: str,
-        date_to: str
+        regions: dict,
+        return_data: dict
     ) -> list:
         """Synthesize cross-functional risks for CEO view."""
         risks = []
 
         # Margin risk
         margin_pct = margin_data.get('margin_pct', 0)
+        margin_fmt = margin_data.get('margin_fmt') or f"{margin_pct:.1f}"
         if margin_pct < 18:
             risks.append(
-                f"MARGIN ALERT: Gross margin at {margin_pct:.1f}% threatens profitability."
+                f"MARGIN ALERT: Gross margin at {margin_fmt}% threatens profitability."
             )
         elif margin_pct < 20:
             risks.append(
-                f"Margin pressure: {margin_pct:.1f}% approaching minimum threshold."
+                f"Margin pressure: {margin_fmt}% approaching minimum threshold."
             )
 
         # Store concentration risk
-        regions = self._get_regional_performance(date_from, date_to)
-        if regions:
-            total_revenue = sum(r.get('revenue', 0) for r in regions)
-            top_region_share = (regions[0].get('revenue', 0) / max(total_revenue, 1)) * 100
+        revenues = regions['revenue']
+        if revenues:
+            top_region_share = (revenues[0] / max(sum(revenues), 1)) * 100
             if top_region_share > 40:
                 risks.append(
-                    f"Geographic concentration: {regions[0]['region']} region "
+                    f"Geographic concentration: {regions['region'][0]} region "
                     f"represents {top_region_share:.1f}% of revenue."
                 )
 
         # Return risk (quality indicator)
-        return_data = self._get_return_summary(date_from, date_to)
         if return_data.get('return_rate', 0) > 5:
+            return_rate_fmt = return_data.get('return_rate_fmt') or f"{return_data['return_rate']:.1f}"
             risks.append(
-                f"Return rate at {return_data['return_rate']:.1f}% may indicate quality issues."
+                f"Return rate at {return_rate_fmt}% may indicate quality issues."
             )
 
         if not risks:
@@ -322,35 +458,24 @@ class CEOAgent(BaseAgent):
 
     def _get_return_summary(self, date_from: str, date_to: str) -> dict:
         """Get return summary for quality assessment."""
-        query = """
-        WITH sales AS (
-            SELECT SUM(qty) as total_sold FROM retail.fact_sales_line
-            WHERE sale_date BETWEEN %s AND %s
-        ),
-        returns AS (
-            SELECT SUM(qty) as total_returned FROM retail.fact_returns_line
-            WHERE return_date BETWEEN %s AND %s
+        return self._parse_return_summary(
+            self.db.execute_query(*self._return_summary_query(date_from, date_to))
         )
-        SELECT
-            COALESCE(r.total_returned, 0) as total_returned,
-            COALESCE(s.total_sold, 0) as total_sold,
-            CASE
-                WHEN COALESCE(s.total_sold, 0) > 0
-                THEN (COALESCE(r.total_returned, 0)::float / s.total_sold * 100)
-                ELSE 0
-            END as return_rate
-        FROM sales s, returns r
-        """
+
+    def _return_summary_query(self, date_from: str, date_to: str) -> tuple:
         self._add_evidence(
             "retail.fact_sales_line + retail.fact_returns_line",
             f"return rate calculation"
         )
-        result = self.db.execute_query(query, (date_from, date_to, date_from, date_to))
+        return _SQL_RETURNS, (date_from, date_to, date_from, date_to)
+
+    def _parse_return_summary(self, result: list) -> dict:
         if result:
             return {
                 'total_returned': result[0]['total_returned'] or 0,
                 'total_sold': result[0]['total_sold'] or 0,
-                'return_rate': result[0]['return_rate'] or 0
+                'return_rate': result[0]['return_rate'] or 0,
+                'return_rate_fmt': result[0].get('return_rate_fmt')
             }
         return {'return_rate': 0}
 
@@ -12,6 +12,21 @@ from .contract import (
     Trend, Confidence
 )
 
+# Recommendations that apply whatever the numbers; each output gets its
+# own Recommendation built from these fields
+_STATIC_RECOMMENDATIONS = (
+    dict(
+        action="Expand high-performing categories to underperforming regions",
+        impact="Balance regional revenue concentration and drive growth",
+        priority="Medium"
+    ),
+    dict(
+        action="Monitor inventory days and optimize stock levels",
+        impact="Improve cash flow and reduce carrying costs",
+        priority="Medium"
+    ),
+)
+
 
 class CEOAgentV2(BaseAgent):
     """
@@ -51,10 +66,23 @@ class CEOAgentV2(BaseAgent):
         'ceo_views.board_summary',
     ]
 
+    # Columns this agent reads from each SELECT-list view; queries project
+    # only these instead of SELECT *
+    NEEDED_COLS = {
+        'ceo_views.board_summary': ('period_start', 'period_end', 'net_revenue', 'units_sold'),
+        'ceo_views.inventory_days_summary': ('total_on_hand', 'avg_daily_units', 'days_of_inventory'),
+        'ceo_views.category_performance': ('category_name',),
+        'ceo_views.sssg_proxy': ('sssg_pct',),
+    }
+
     def _get_role_name(self) -> str:
         """Return role name for guardrails initialization."""
         return "CEO"
 
+    def _columns(self, view: str) -> str:
+        """SELECT list for a view, from NEEDED_COLS."""
+        return ", ".join(self.NEEDED_COLS[view])
+
     @property
     def role(self) -> AgentRole:
         return AgentRole.CEO
@@ -63,7 +91,12 @@ class CEOAgentV2(BaseAgent):
         """Perform CEO-level strategic analysis using allowed views only."""
 
         # Get date range from board summary
-        board_summary = self._get_board_summary()
+        if not date_from or not date_to:
+            board_summary = self._get_board_summary()
+            queries = []
+        else:
+            board_summary = None
+            queries = [self._board_summary_query()]
         if not date_from:
             date_from = board_summary.get('period_start', '2025-01-01')
         if not date_to:
@@ -71,6 +104,22 @@ class CEOAgentV2(BaseAgent):
 
         window = f"{date_from} to {date_to}"
 
+        # Fetch all remaining independent metrics in a single round-trip
+        queries += [
+            self._margin_summary_query(date_from, date_to),
+            self._inventory_days_query(),
+            self._category_performance_query(3),
+            self._regional_concentration_query(),
+            self._sssg_query(),
+        ]
+        results = self.db.execute_many_queries(queries)
+        if board_summary is None:
+            board_summary = self._parse_board_summary(results.pop(0))
+        (margin_rows, inventory_rows, categories,
+         concentration_rows, sssg) = results
+        margin_data = self._parse_margin_summary(margin_rows)
+        inventory_data = self._parse_inventory_days(inventory_rows)
+
         # Calculate strategic KPIs using allowed views
         kpis = []
 
@@ -84,12 +133,11 @@ class CEOAgentV2(BaseAgent):
         ))
 
         # 2. Gross Margin from margin summary
-        margin_data = self._get_margin_summary(date_from, date_to)
         kpis.append(KPI(
             name="Gross Margin",
             value=round(margin_data['margin_pct'], 1),
             unit="%",
-            trend=self._get_margin_trend(date_from, date_to),
+            trend=self._parse_margin_trend(margin_rows),
             window=window
         ))
 
@@ -103,7 +151,6 @@ class CEOAgentV2(BaseAgent):
         ))
 
         # 4. Inventory Days
-        inventory_data = self._get_inventory_days()
         kpis.append(KPI(
             name="Days of Inventory",
             value=round(inventory_data['days_of_inventory'], 1),
@@ -113,10 +160,12 @@ class CEOAgentV2(BaseAgent):
         ))
 
         # Generate insights from allowed views
-        insights = self._generate_insights(board_summary, margin_data, date_from, date_to)
+        insights = self._generate_insights(board_summary, margin_data, categories)
 
         # Identify risks from regional and category data
-        risks = self._identify_risks(date_from, date_to)
+        risks = self._identify_risks(
+            self._parse_regional_concentration(concentration_rows), sssg
+        )
 
         # Generate strategic recommendations
         recommendations = self._generate_recommendations(margin_data)
@@ -133,9 +182,14 @@ class CEOAgentV2(BaseAgent):
 
     def _get_board_summary(self) -> dict:
         """Get executive summary from ceo_views.board_summary."""
-        query = "SELECT * FROM ceo_views.board_summary"
+        return self._parse_board_summary(self.db.execute_query(*self._board_summary_query()))
+
+    def _board_summary_query(self) -> tuple:
+        query = f"SELECT {self._columns('ceo_views.board_summary')} FROM ceo_views.board_summary"
         self._add_evidence("ceo_views.board_summary", "executive summary")
-        result = self.db.execute_query(query)
+        return query, None
+
+    def _parse_board_summary(self, result: list) -> dict:
         if result:
             return {
                 'period_start': result[0].get('period_start'),
@@ -147,56 +201,73 @@ class CEOAgentV2(BaseAgent):
 
     def _get_margin_summary(self, date_from: str, date_to: str) -> dict:
         """Get margin summary from ceo_views.margin_summary."""
-        query = """
-        SELECT
-            SUM(gross_revenue) AS gross_revenue,
-            SUM(total_cogs) AS total_cogs,
-            SUM(gross_margin) AS gross_margin,
-            CASE
-                WHEN SUM(gross_revenue) > 0
-                THEN ROUND((SUM(gross_margin) / SUM(gross_revenue) * 100)::numeric, 2)
-                ELSE 0
-            END AS margin_pct
-        FROM ceo_views.margin_summary
-        WHERE sale_date BETWEEN %s AND %s
-        """
-        self._add_evidence("ceo_views.margin_summary", f"sale_date between '{date_from}' and '{date_to}'")
-        result = self.db.execute_query(query, (date_from, date_to))
-        if result:
-            return {
-                'gross_revenue': result[0].get('gross_revenue', 0) or 0,
-                'total_cogs': result[0].get('total_cogs', 0) or 0,
-                'gross_margin': result[0].get('gross_margin', 0) or 0,
-                'margin_pct': result[0].get('margin_pct', 0) or 0
-            }
-        return {'margin_pct': 0}
+        return self._parse_margin_summary(
+            self.db.execute_query(*self._margin_summary_query(date_from, date_to))
+        )
 
-    def _get_margin_trend(self, date_from: str, date_to: str) -> Trend:
-        """Calculate margin trend from ceo_views.margin_summary."""
+    def _margin_summary_query(self, date_from: str, date_to: str) -> tuple:
+        """Margin totals plus first/last month margin % (for the trend) in one scan."""
         query = """
         WITH monthly AS (
             SELECT
                 DATE_TRUNC('month', sale_date) AS month,
-                SUM(gross_margin) / NULLIF(SUM(gross_revenue), 0) * 100 AS margin_pct
+                SUM(gross_revenue) AS gross_revenue,
+                SUM(total_cogs) AS total_cogs,
+                SUM(gross_margin) AS gross_margin
             FROM ceo_views.margin_summary
             WHERE sale_date BETWEEN %s AND %s
             GROUP BY DATE_TRUNC('month', sale_date)
-            ORDER BY month
         )
         SELECT
-            (SELECT margin_pct FROM monthly ORDER BY month LIMIT 1) AS first_month,
-            (SELECT margin_pct FROM monthly ORDER BY month DESC LIMIT 1) AS last_month
+            COALESCE(SUM(gross_revenue), 0) AS gross_revenue,
+            COALESCE(SUM(total_cogs), 0) AS total_cogs,
+            COALESCE(SUM(gross_margin), 0) AS gross_margin,
+            CASE
+                WHEN SUM(gross_revenue) > 0
+                THEN SUM(gross_margin)::float8 / SUM(gross_revenue) * 100
+                ELSE 0
+            END AS margin_pct,
+            (ARRAY_AGG(gross_margin / NULLIF(gross_revenue, 0) * 100 ORDER BY month))[1] AS first_month,
+            (ARRAY_AGG(gross_margin / NULLIF(gross_revenue, 0) * 100 ORDER BY month DESC))[1] AS last_month
+        FROM monthly
         """
-        result = self.db.execute_query(query, (date_from, date_to))
+        self._add_evidence("ceo_views.margin_summary", f"sale_date between '{date_from}' and '{date_to}'")
+        return query, (date_from, date_to)
+
+    def _parse_margin_summary(self, result: list) -> dict:
+        # One ungrouped-aggregate row, NULL totals already COALESCEd to 0
+        row = result[0]
+        return {
+            'gross_revenue': row['gross_revenue'],
+            'total_cogs': row['total_cogs'],
+            'gross_margin': row['gross_margin'],
+            'margin_pct': row['margin_pct']
+        }
+
+    def _get_margin_trend(self, date_from: str, date_to: str) -> Trend:
+        """Calculate margin trend from ceo_views.margin_summary."""
+        return self._parse_margin_trend(
+            self.db.execute_query(*self._margin_summary_query(date_from, date_to))
+        )
+
+    def _parse_margin_trend(self, result: list) -> Trend:
         if result and result[0]['first_month'] and result[0]['last_month']:
             return self._calculate_trend(result[0]['last_month'], result[0]['first_month'])
         return Trend.FLAT
 
     def _get_inventory_days(self) -> dict:
         """Get inventory days from ceo_views.inventory_days_summary."""
-        query = "SELECT * FROM ceo_views.inventory_days_summary"
+        return self._parse_inventory_days(self.db.execute_query(*self._inventory_days_query()))
+
+    def _inventory_days_query(self) -> tuple:
+        query = (
+            f"SELECT {self._columns('ceo_views.inventory_days_summary')} "
+            "FROM ceo_views.inventory_days_summary"
+        )
         self._add_evidence("ceo_views.inventory_days_summary", "current inventory health")
-        result = self.db.execute_query(query)
+        return query, None
+
+    def _parse_inventory_days(self, result: list) -> dict:
         if result:
             return {
                 'total_on_hand': result[0].get('total_on_hand', 0) or 0,
@@ -205,26 +276,62 @@ class CEOAgentV2(BaseAgent):
             }
         return {'days_of_inventory': 0}
 
-    def _get_regional_performance(self) -> list:
-        """Get regional performance from ceo_views.regional_performance."""
-        query = "SELECT * FROM ceo_views.regional_performance ORDER BY net_revenue DESC"
+    def _get_regional_concentration(self) -> dict:
+        """Get the top region's revenue share from ceo_views.regional_performance."""
+        return self._parse_regional_concentration(
+            self.db.execute_query(*self._regional_concentration_query())
+        )
+
+    def _regional_concentration_query(self) -> tuple:
+        query = """
+        SELECT
+            region AS top_region,
+            net_revenue * 100.0 / NULLIF(SUM(net_revenue) OVER (), 0) AS top_region_share_pct,
+            SUM(net_revenue) OVER () AS total_rev
+        FROM ceo_views.regional_performance
+        ORDER BY net_revenue DESC
+        LIMIT 1
+        """
         self._add_evidence("ceo_views.regional_performance", "regional aggregates")
-        return self.db.execute_query(query)
+        return query, None
+
+    def _parse_regional_concentration(self, result: list) -> dict:
+        if result:
+            return result[0]
+        return {}
 
     def _get_category_performance(self, limit: int = 5) -> list:
         """Get category performance from ceo_views.category_performance."""
-        query = f"SELECT * FROM ceo_views.category_performance LIMIT {limit}"
+        return self.db.execute_query(*self._category_performance_query(limit))
+
+    def _category_performance_query(self, limit: int = 5) -> tuple:
+        query = (
+            f"SELECT {self._columns('ceo_views.category_performance')} "
+            "FROM ceo_views.category_performance LIMIT %s"
+        )
+        limit = self._clamp_limit(limit)
         self._add_evidence("ceo_views.category_performance", f"top {limit} categories")
-        return self.db.execute_query(query)
+        return query, (limit,)
 
     def _get_sssg(self) -> list:
         """Get same-store sales growth from ceo_views.sssg_proxy."""
-        query = "SELECT * FROM ceo_views.sssg_proxy ORDER BY current_month DESC LIMIT 3"
+        return self.db.execute_query(*self._sssg_query())
+
+    def _sssg_query(self) -> tuple:
+        # Latest period only; "declining" needs at least two periods of history
+        query = f"""
+        SELECT
+            {self._columns('ceo_views.sssg_proxy')},
+            COALESCE(sssg_pct < 0 AND COUNT(*) OVER () >= 2, false) AS declining
+        FROM ceo_views.sssg_proxy
+        ORDER BY current_month DESC
+        LIMIT 1
+        """
         self._add_evidence("ceo_views.sssg_proxy", "recent SSSG trends")
-        return self.db.execute_query(query)
+        return query, None
 
     def _generate_insights(self, board_summary: dict, margin_data: dict,
-                          date_from: str, date_to: str) -> list:
+                          categories: list) -> list:
         """Generate insights from allowed views only."""
         insights = []
 
@@ -245,35 +352,27 @@ class CEOAgentV2(BaseAgent):
             insights.append(f"Gross margin of {margin_pct:.1f}% below 20% target - review needed.")
 
         # Category insight from allowed view
-        categories = self._get_category_performance(3)
         if categories:
             top_cats = [c['category_name'] for c in categories[:3]]
             insights.append(f"Revenue led by: {', '.join(top_cats)}.")
 
         return insights
 
-    def _identify_risks(self, date_from: str, date_to: str) -> list:
+    def _identify_risks(self, concentration: dict, sssg: list) -> list:
         """Identify risks from allowed views only."""
         risks = []
 
         # Regional concentration from allowed view
-        regions = self._get_regional_performance()
-        if regions:
-            total_rev = sum(r.get('net_revenue', 0) for r in regions)
-            if total_rev > 0:
-                top_region_share = (regions[0].get('net_revenue', 0) / total_rev) * 100
-                if top_region_share > 40:
-                    risks.append(
-                        f"Geographic concentration: {regions[0]['region']} region "
-                        f"represents {top_region_share:.1f}% of revenue."
-                    )
+        top_region_share = concentration.get('top_region_share_pct')
+        if top_region_share is not None and top_region_share > 40:
+            risks.append(
+                f"Geographic concentration: {concentration['top_region']} region "
+                f"represents {top_region_share:.1f}% of revenue."
+            )
 
         # SSSG trend risk
-        sssg = self._get_sssg()
-        if sssg and len(sssg) >= 2:
-            latest_sssg = sssg[0].get('sssg_pct', 0)
-            if latest_sssg and latest_sssg < 0:
-                risks.append(f"Same-store sales declining: {latest_sssg:.1f}% in latest period.")
+        if sssg and sssg[0].get('declining'):
+            risks.append(f"Same-store sales declining: {sssg[0]['sssg_pct']:.1f}% in latest period.")
 
         if not risks:
             risks.append("No critical strategic risks identified from available data.")
@@ -293,17 +392,7 @@ class CEOAgentV2(BaseAgent):
                 priority="High" if margin_pct < 20 else "Medium"
             ))
 
-        recommendations.append(Recommendation(
-            action="Expand high-performing categories to underperforming regions",
-            impact="Balance regional revenue concentration and drive growth",
-            priority="Medium"
-        ))
-
-        recommendations.append(Recommendation(
-            action="Monitor inventory days and optimize stock levels",
-            impact="Improve cash flow and reduce carrying costs",
-            priority="Medium"
-        ))
+        recommendations.extend(Recommendation(**fields) for fields in _STATIC_RECOMMENDATIONS)
 
         return recommendations
 
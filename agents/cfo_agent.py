@@ -11,6 +11,19 @@ from .contract import (
     Trend, Confidence
 )
 
+# Recommendations that apply whatever the numbers; each output gets its
+# own Recommendation built from these fields
+_CAP_DISCOUNTS = dict(
+    action="Cap promotional discounts at 10% for standard SKUs",
+    impact="Protect margin floor while maintaining competitiveness",
+    priority="High"
+)
+_REVIEW_SUPPLIER_COSTS = dict(
+    action="Analyze supplier costs for top-volume SKUs",
+    impact="Potential COGS reduction of 2-5% through renegotiation",
+    priority="Medium"
+)
+
 
 class CFOAgent(BaseAgent):
     """
@@ -36,21 +49,25 @@ class CFOAgent(BaseAgent):
         filters = f"sale_date between '{date_from}' and '{date_to}'"
         window = f"{date_from} to {date_to}"
 
+        # All sales/margin aggregates in one round-trip
+        snapshot = self._get_financial_snapshot(date_from, date_to)
+        margin_data = snapshot['margin']
+        revenue_data = snapshot['revenue']
+        discount_data = snapshot['discount']
+
         # Calculate KPIs
         kpis = []
 
         # 1. Gross Margin %
-        margin_data = self._get_margin_metrics(date_from, date_to)
         kpis.append(KPI(
             name="Gross Margin %",
             value=round(margin_data['margin_pct'], 1),
             unit="%",
-            trend=self._calculate_margin_trend(date_from, date_to),
+            trend=snapshot['margin_trend'],
             window=window
         ))
 
         # 2. Net Revenue
-        revenue_data = self._get_revenue_metrics(date_from, date_to)
         kpis.append(KPI(
             name="Net Revenue",
             value=round(revenue_data['net_revenue'], 2),
@@ -69,7 +86,6 @@ class CFOAgent(BaseAgent):
         ))
 
         # 4. Discount Rate
-        discount_data = self._get_discount_metrics(date_from, date_to)
         kpis.append(KPI(
             name="Avg Discount Rate",
             value=round(discount_data['discount_rate'], 1),
@@ -97,67 +113,91 @@ class CFOAgent(BaseAgent):
             confidence=Confidence.HIGH if margin_data['total_revenue'] > 0 else Confidence.LOW
         )
 
-    def _get_margin_metrics(self, date_from: str, date_to: str) -> dict:
-        """Calculate margin metrics from the margin view."""
+    def _get_financial_snapshot(self, date_from: str, date_to: str) -> dict:
+        """
+        Get margin, revenue, discount and margin-trend metrics in one query.
+
+        The margin view is aggregated by month once; totals and the
+        first/last month margin % come from that same pass. The sales view
+        supplies revenue and discount totals.
+        """
         query = """
-        SELECT
-            SUM(gross_revenue) as total_revenue,
-            SUM(cogs) as total_cogs,
-            SUM(gross_margin) as total_margin,
-            CASE
-                WHEN SUM(gross_revenue) > 0
-                THEN (SUM(gross_margin) / SUM(gross_revenue) * 100)
-                ELSE 0
-            END as margin_pct
-        FROM retail.v_margin_daily_store_sku
-        WHERE sale_date BETWEEN %s AND %s
+        WITH monthly AS (
+            SELECT
+                DATE_TRUNC('month', sale_date) as month,
+                SUM(gross_revenue) as revenue,
+                SUM(cogs) as cogs,
+                SUM(gross_margin) as margin
+            FROM retail.v_margin_daily_store_sku
+            WHERE sale_date BETWEEN %s AND %s
+            GROUP BY DATE_TRUNC('month', sale_date)
+        ),
+        m AS (
+            SELECT
+                COALESCE(SUM(revenue), 0) as total_revenue,
+                COALESCE(SUM(cogs), 0) as total_cogs,
+                COALESCE(SUM(margin), 0) as total_margin,
+                CASE
+                    WHEN SUM(revenue) > 0
+                    THEN (SUM(margin) / SUM(revenue) * 100)
+                    ELSE 0
+                END as margin_pct,
+                (ARRAY_AGG(margin/NULLIF(revenue,0)*100 ORDER BY month))[1] as first_month,
+                (ARRAY_AGG(margin/NULLIF(revenue,0)*100 ORDER BY month DESC))[1] as last_month
+            FROM monthly
+        ),
+        s AS (
+            SELECT
+                COALESCE(SUM(gross_revenue), 0) as gross_revenue,
+                COALESCE(SUM(discount), 0) as total_discount,
+                COALESCE(SUM(net_revenue), 0) as net_revenue,
+                COALESCE(SUM(units_sold), 0) as total_units,
+                CASE
+                    WHEN SUM(gross_revenue) > 0
+                    THEN (SUM(discount) / SUM(gross_revenue) * 100)
+                    ELSE 0
+                END as discount_rate
+            FROM retail.v_sales_daily_store_category
+            WHERE sale_date BETWEEN %s AND %s
+        )
+        SELECT m.*, s.* FROM m, s
         """
         self._add_evidence(
             "retail.v_margin_daily_store_sku",
             f"sale_date between '{date_from}' and '{date_to}'"
         )
-        result = self.db.execute_query(query, (date_from, date_to))
-        return result[0] if result else {
-            'total_revenue': 0, 'total_cogs': 0, 'total_margin': 0, 'margin_pct': 0
-        }
-
-    def _get_revenue_metrics(self, date_from: str, date_to: str) -> dict:
-        """Calculate revenue metrics."""
-        query = """
-        SELECT
-            SUM(gross_revenue) as gross_revenue,
-            SUM(discount) as total_discount,
-            SUM(net_revenue) as net_revenue,
-            SUM(units_sold) as total_units
-        FROM retail.v_sales_daily_store_category
-        WHERE sale_date BETWEEN %s AND %s
-        """
         self._add_evidence(
             "retail.v_sales_daily_store_category",
             f"sale_date between '{date_from}' and '{date_to}'"
         )
-        result = self.db.execute_query(query, (date_from, date_to))
-        return result[0] if result else {
-            'gross_revenue': 0, 'total_discount': 0, 'net_revenue': 0, 'total_units': 0
-        }
+        # Ungrouped aggregates always return exactly one row, with totals
+        # already COALESCEd to 0 server-side
+        row = self.db.execute_query(query, (date_from, date_to, date_from, date_to))[0]
 
-    def _get_discount_metrics(self, date_from: str, date_to: str) -> dict:
-        """Calculate discount metrics."""
-        query = """
-        SELECT
-            SUM(discount) as total_discount,
-            SUM(gross_revenue) as gross_revenue,
-            CASE
-                WHEN SUM(gross_revenue) > 0
-                THEN (SUM(discount) / SUM(gross_revenue) * 100)
-                ELSE 0
-            END as discount_rate
-        FROM retail.v_sales_daily_store_category
-        WHERE sale_date BETWEEN %s AND %s
-        """
-        result = self.db.execute_query(query, (date_from, date_to))
-        return result[0] if result else {
-            'total_discount': 0, 'gross_revenue': 0, 'discount_rate': 0
+        if row['first_month'] and row['last_month']:
+            margin_trend = self._calculate_trend(row['last_month'], row['first_month'])
+        else:
+            margin_trend = Trend.FLAT
+
+        return {
+            'margin': {
+                'total_revenue': row['total_revenue'],
+                'total_cogs': row['total_cogs'],
+                'total_margin': row['total_margin'],
+                'margin_pct': row['margin_pct'],
+            },
+            'revenue': {
+                'gross_revenue': row['gross_revenue'],
+                'total_discount': row['total_discount'],
+                'net_revenue': row['net_revenue'],
+                'total_units': row['total_units'],
+            },
+            'discount': {
+                'total_discount': row['total_discount'],
+                'gross_revenue': row['gross_revenue'],
+                'discount_rate': row['discount_rate'],
+            },
+            'margin_trend': margin_trend,
         }
 
     def _get_category_margin_breakdown(self, date_from: str, date_to: str) -> list:
@@ -185,28 +225,6 @@ class CFOAgent(BaseAgent):
         )
         return self.db.execute_query(query, (date_from, date_to))
 
-    def _calculate_margin_trend(self, date_from: str, date_to: str) -> Trend:
-        """Calculate margin trend by comparing first and last month."""
-        query = """
-        WITH monthly AS (
-            SELECT
-                DATE_TRUNC('month', sale_date) as month,
-                SUM(gross_revenue) as revenue,
-                SUM(gross_margin) as margin
-            FROM retail.v_margin_daily_store_sku
-            WHERE sale_date BETWEEN %s AND %s
-            GROUP BY DATE_TRUNC('month', sale_date)
-            ORDER BY month
-        )
-        SELECT
-            (SELECT margin/NULLIF(revenue,0)*100 FROM monthly ORDER BY month LIMIT 1) as first_month,
-            (SELECT margin/NULLIF(revenue,0)*100 FROM monthly ORDER BY month DESC LIMIT 1) as last_month
-        """
-        result = self.db.execute_query(query, (date_from, date_to))
-        if result and result[0]['first_month'] and result[0]['last_month']:
-            return self._calculate_trend(result[0]['last_month'], result[0]['first_month'])
-        return Trend.FLAT
-
     def _generate_insights(self, margin_data: dict, revenue_data: dict, discount_data: dict) -> list:
         """Generate CFO insights from the data."""
         insights = []
@@ -280,17 +298,9 @@ class CFOAgent(BaseAgent):
             ))
 
         if discount_rate > 8:
-            recommendations.append(Recommendation(
-                action=f"Cap promotional discounts at 10% for standard SKUs",
-                impact="Protect margin floor while maintaining competitiveness",
-                priority="High"
-            ))
+            recommendations.append(Recommendation(**_CAP_DISCOUNTS))
 
-        recommendations.append(Recommendation(
-            action="Analyze supplier costs for top-volume SKUs",
-            impact="Potential COGS reduction of 2-5% through renegotiation",
-            priority="Medium"
-        ))
+        recommendations.append(Recommendation(**_REVIEW_SUPPLIER_COSTS))
 
         return recommendations
 
@@ -5,13 +5,58 @@ Chief Financial Officer - Uses ONLY allowed views from cfo_views schema.
 NO access to raw customer data or raw supplier tables.
 """
 
+from dataclasses import dataclass, fields
 from typing import Optional
+import psycopg2
 from .base_agent import BaseAgent, DatabaseConnection, GuardrailedDatabaseConnection
 from .contract import (
     AgentOutput, AgentRole, KPI, Recommendation, Evidence,
     Trend, Confidence
 )
 
+# Age of the oldest materialized CFO view (see performance_schema.sql),
+# and whether the one-row inventory summary has been created
+_SQL_REFRESH_STATUS = """
+SELECT
+    EXTRACT(EPOCH FROM now() - MIN(refreshed_at)) / 3600 AS hours_since_refresh,
+    COALESCE(BOOL_OR(view_name = 'inventory_value_summary'), false) AS has_inventory_summary
+FROM cfo_views.mv_refresh_log
+"""
+
+# Output text templates, formatted with str.format against the P&L summary
+# (pnl), discount/returns/inventory dicts or plain values
+_INSIGHT_MARGIN = "Gross margin at {pnl.margin_pct:.1f}% with net revenue of ${pnl.net_revenue:,.0f}."
+_INSIGHT_DISCOUNT_HIGH = "Discount rate of {0:.1f}% impacting margins."
+_INSIGHT_DISCOUNT_OK = "Discount rate controlled at {0:.1f}%."
+_INSIGHT_COGS = "COGS represents {pnl.cogs_pct:.1f}% of net revenue."
+_RISK_MARGIN_BELOW_TARGET = "Margin at {0:.1f}% is below 20% target threshold."
+_RISK_MARGIN_CRITICAL = "Critical: Margin approaching floor level. Immediate review needed."
+_RISK_RETURNS = "Returns at {0:.1f}% of revenue - above 3% threshold."
+_RISK_CATEGORY = "Low margin in {category_name}: {margin_pct:.1f}%"
+_RISK_NONE = "Financial metrics within acceptable ranges."
+_IMPACT_MARGIN = "Target margin increase from {0:.1f}% toward 25%"
+_IMPACT_DISCOUNT = "Reduce discount rate from {0:.1f}% to protect margins"
+_IMPACT_INVENTORY = "Current inventory at ${cost_value:,.0f} cost value"
+
+
+@dataclass(slots=True)
+class PnlSummary:
+    """Totals from cfo_views.daily_pnl for the analysis window."""
+    gross_revenue: float = 0.0
+    discounts: float = 0.0
+    net_revenue: float = 0.0
+    cogs: float = 0.0
+    gross_profit: float = 0.0
+    returns: float = 0.0
+    adjusted_gross_profit: float = 0.0
+    margin_pct: float = 0.0
+    cogs_pct: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: dict) -> "PnlSummary":
+        """Build from a query row; SUM over no rows gives NULL, read as 0."""
+        return cls(*(row.get(f.name) or 0.0 for f in fields(cls)))
+
 
 class CFOAgentV2(BaseAgent):
     """
@@ -22,6 +67,8 @@ class CFOAgentV2(BaseAgent):
     - cfo_views.margin_by_category
     - cfo_views.cogs_summary
     - cfo_views.inventory_value
+    - cfo_views.inventory_value_summary (materialized, see performance_schema.sql)
+    - cfo_views.mv_refresh_log
     - cfo_views.returns_impact
     - cfo_views.returns_by_reason
     - cfo_views.po_summary
@@ -47,6 +94,8 @@ class CFOAgentV2(BaseAgent):
         'cfo_views.margin_by_category',
         'cfo_views.cogs_summary',
         'cfo_views.inventory_value',
+        'cfo_views.inventory_value_summary',
+        'cfo_views.mv_refresh_log',
         'cfo_views.returns_impact',
         'cfo_views.returns_by_reason',
         'cfo_views.po_summary',
@@ -54,6 +103,15 @@ class CFOAgentV2(BaseAgent):
         'cfo_views.daily_pnl',
     ]
 
+    # Materialized views are refreshed hourly; allow one missed refresh
+    STALE_AFTER_HOURS = 2
+
+    # Category margin % below which a category is flagged as a risk
+    CATEGORY_MARGIN_FLOOR = 15
+
+    # Set by _stale_check; read the precomputed inventory totals when True
+    _inventory_summary_available = False
+
     def _get_role_name(self) -> str:
         """Return role name for guardrails initialization."""
         return "CFO"
@@ -70,25 +128,29 @@ class CFOAgentV2(BaseAgent):
             date_from, date_to = self._get_date_range_from_pnl()
 
         window = f"{date_from} to {date_to}"
+        stale = self._stale_check()
+
+        # Every metric below comes from one round-trip
+        bundle = self._get_cfo_bundle(date_from, date_to)
+        pnl_data = bundle['pnl']
+        discount_data = bundle['discount']
 
         # Calculate KPIs from allowed views
         kpis = []
 
         # 1. Gross Margin % from daily P&L
-        pnl_data = self._get_pnl_summary(date_from, date_to)
-        margin_pct = (pnl_data['gross_profit'] / max(pnl_data['net_revenue'], 1)) * 100
         kpis.append(KPI(
             name="Gross Margin %",
-            value=round(margin_pct, 1),
+            value=round(pnl_data.margin_pct, 1),
             unit="%",
-            trend=self._get_margin_trend(date_from, date_to),
+            trend=bundle['margin_trend'],
             window=window
         ))
 
         # 2. Net Revenue
         kpis.append(KPI(
             name="Net Revenue",
-            value=round(pnl_data['net_revenue'], 2),
+            value=round(pnl_data.net_revenue, 2),
             unit="$",
             trend=Trend.UP,
             window=window
@@ -97,14 +159,13 @@ class CFOAgentV2(BaseAgent):
         # 3. Total COGS
         kpis.append(KPI(
             name="Total COGS",
-            value=round(pnl_data['cogs'], 2),
+            value=round(pnl_data.cogs, 2),
             unit="$",
             trend=Trend.UP,
             window=window
         ))
 
         # 4. Discount Rate from discount_analysis
-        discount_data = self._get_discount_summary(date_from, date_to)
         kpis.append(KPI(
             name="Avg Discount Rate",
             value=round(discount_data['discount_rate'], 1),
@@ -117,10 +178,17 @@ class CFOAgentV2(BaseAgent):
         insights = self._generate_insights(pnl_data, discount_data, date_from, date_to)
 
         # Identify risks
-        risks = self._identify_risks(pnl_data, discount_data, date_from, date_to)
+        risks = self._identify_risks(pnl_data, bundle['returns'], bundle['low_margin_categories'])
 
         # Generate recommendations
-        recommendations = self._generate_recommendations(pnl_data, discount_data)
+        recommendations = self._generate_recommendations(pnl_data, discount_data, bundle['inventory'])
+
+        if pnl_data.net_revenue <= 0:
+            confidence = Confidence.LOW
+        elif stale:
+            confidence = Confidence.MEDIUM
+        else:
+            confidence = Confidence.HIGH
 
         return AgentOutput(
             agent=self.role,
@@ -129,9 +197,60 @@ class CFOAgentV2(BaseAgent):
             risks=risks[:3],
             recommendations=recommendations[:3],
             evidence=self._evidence,
-            confidence=Confidence.HIGH if pnl_data['net_revenue'] > 0 else Confidence.LOW
+            confidence=confidence
         )
 
+    @property
+    def _refresh_log_available(self) -> Optional[bool]:
+        """Whether cfo_views.mv_refresh_log is readable; None until first checked."""
+        return self._feature_available('cfo_views.mv_refresh_log')
+
+    def _stale_check(self) -> bool:
+        """
+        Whether the materialized CFO views are overdue for a refresh.
+
+        Always False while the views are plain views, i.e. before
+        performance_schema.sql has been applied, or when this role cannot
+        read cfo_views.mv_refresh_log. Also records whether
+        cfo_views.inventory_value_summary exists.
+        """
+        if self._refresh_log_available is False:
+            return False
+        try:
+            # Columnar reads skip the query cache, so the age stays current
+            status = self.db.execute_query_columnar(_SQL_REFRESH_STATUS)
+        except (psycopg2.errors.UndefinedTable, psycopg2.errors.InsufficientPrivilege):
+            # No log yet, or this role was never granted SELECT on it
+            self._set_feature_available('cfo_views.mv_refresh_log', False)
+            return False
+        self._set_feature_available('cfo_views.mv_refresh_log', True)
+        self._inventory_summary_available = status['has_inventory_summary'][0]
+        hours = status['hours_since_refresh'][0]
+        return hours is not None and hours > self.STALE_AFTER_HOURS
+
+    def _get_cfo_bundle(self, date_from: str, date_to: str) -> dict:
+        """
+        Fetch the P&L, discount, margin trend, returns, category margin and
+        inventory metrics in a single round-trip.
+        """
+        (pnl_rows, discount_rows, trend_rows,
+         returns_rows, category_rows, inventory_rows) = self.db.execute_many_queries([
+            self._pnl_summary_query(date_from, date_to),
+            self._discount_summary_query(date_from, date_to),
+            self._margin_trend_query(date_from, date_to),
+            self._returns_summary_query(date_from, date_to),
+            self._margin_by_category_query(date_from, date_to),
+            self._inventory_value_query(),
+        ])
+        return {
+            'pnl': self._parse_pnl_summary(pnl_rows),
+            'discount': self._parse_discount_summary(discount_rows),
+            'margin_trend': self._parse_margin_trend(trend_rows),
+            'returns': self._parse_returns_summary(returns_rows),
+            'low_margin_categories': category_rows,
+            'inventory': self._parse_inventory_value(inventory_rows),
+        }
+
     def _get_date_range_from_pnl(self) -> tuple:
         """Get date range from daily P&L view."""
         query = "SELECT MIN(sale_date) as min_date, MAX(sale_date) as max_date FROM cfo_views.daily_pnl"
@@ -140,8 +259,13 @@ class CFOAgentV2(BaseAgent):
             return result[0]['min_date'], result[0]['max_date']
         return '2025-01-01', '2025-03-31'
 
-    def _get_pnl_summary(self, date_from: str, date_to: str) -> dict:
+    def _get_pnl_summary(self, date_from: str, date_to: str) -> PnlSummary:
         """Get P&L summary from cfo_views.daily_pnl."""
+        return self._parse_pnl_summary(
+            self.db.execute_query(*self._pnl_summary_query(date_from, date_to))
+        )
+
+    def _pnl_summary_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             SUM(gross_revenue) AS gross_revenue,
@@ -150,26 +274,33 @@ class CFOAgentV2(BaseAgent):
             SUM(cogs) AS cogs,
             SUM(gross_profit) AS gross_profit,
             SUM(returns) AS returns,
-            SUM(adjusted_gross_profit) AS adjusted_gross_profit
+            SUM(adjusted_gross_profit) AS adjusted_gross_profit,
+            CASE
+                WHEN SUM(net_revenue) > 0
+                THEN SUM(gross_profit) / SUM(net_revenue) * 100
+                ELSE 0
+            END AS margin_pct,
+            CASE
+                WHEN SUM(net_revenue) > 0
+                THEN SUM(cogs) / SUM(net_revenue) * 100
+                ELSE 0
+            END AS cogs_pct
         FROM cfo_views.daily_pnl
         WHERE sale_date BETWEEN %s AND %s
         """
         self._add_evidence("cfo_views.daily_pnl", f"sale_date between '{date_from}' and '{date_to}'")
-        result = self.db.execute_query(query, (date_from, date_to))
-        if result:
-            return {
-                'gross_revenue': result[0].get('gross_revenue', 0) or 0,
-                'discounts': result[0].get('discounts', 0) or 0,
-                'net_revenue': result[0].get('net_revenue', 0) or 0,
-                'cogs': result[0].get('cogs', 0) or 0,
-                'gross_profit': result[0].get('gross_profit', 0) or 0,
-                'returns': result[0].get('returns', 0) or 0,
-                'adjusted_gross_profit': result[0].get('adjusted_gross_profit', 0) or 0
-            }
-        return {'net_revenue': 0, 'cogs': 0, 'gross_profit': 0}
+        return query, (date_from, date_to)
+
+    def _parse_pnl_summary(self, result: list) -> PnlSummary:
+        return PnlSummary.from_row(result[0]) if result else PnlSummary()
 
     def _get_discount_summary(self, date_from: str, date_to: str) -> dict:
         """Get discount summary from cfo_views.discount_analysis."""
+        return self._parse_discount_summary(
+            self.db.execute_query(*self._discount_summary_query(date_from, date_to))
+        )
+
+    def _discount_summary_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             SUM(gross_revenue) AS gross_revenue,
@@ -183,7 +314,9 @@ class CFOAgentV2(BaseAgent):
         WHERE sale_date BETWEEN %s AND %s
         """
         self._add_evidence("cfo_views.discount_analysis", f"sale_date between '{date_from}' and '{date_to}'")
-        result = self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to)
+
+    def _parse_discount_summary(self, result: list) -> dict:
         if result:
             return {
                 'gross_revenue': result[0].get('gross_revenue', 0) or 0,
@@ -193,7 +326,10 @@ class CFOAgentV2(BaseAgent):
         return {'discount_rate': 0}
 
     def _get_margin_by_category(self, date_from: str, date_to: str) -> list:
-        """Get margin by category from cfo_views.margin_by_category."""
+        """Get the lowest-margin category below CATEGORY_MARGIN_FLOOR, if any."""
+        return self.db.execute_query(*self._margin_by_category_query(date_from, date_to))
+
+    def _margin_by_category_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             category_name,
@@ -208,14 +344,24 @@ class CFOAgentV2(BaseAgent):
         FROM cfo_views.margin_by_category
         WHERE sale_date BETWEEN %s AND %s
         GROUP BY category_name
+        HAVING CASE
+                WHEN SUM(gross_revenue) > 0
+                THEN SUM(gross_margin) * 100 / NULLIF(SUM(gross_revenue), 0)
+                ELSE 0
+            END < %s
         ORDER BY margin_pct ASC
-        LIMIT 5
+        LIMIT 1
         """
         self._add_evidence("cfo_views.margin_by_category", f"lowest margin categories")
-        return self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to, self.CATEGORY_MARGIN_FLOOR)
 
     def _get_margin_trend(self, date_from: str, date_to: str) -> Trend:
         """Calculate margin trend from daily P&L."""
+        return self._parse_margin_trend(
+            self.db.execute_query(*self._margin_trend_query(date_from, date_to))
+        )
+
+    def _margin_trend_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         WITH monthly AS (
             SELECT
@@ -224,19 +370,26 @@ class CFOAgentV2(BaseAgent):
             FROM cfo_views.daily_pnl
             WHERE sale_date BETWEEN %s AND %s
             GROUP BY DATE_TRUNC('month', sale_date)
-            ORDER BY month
         )
         SELECT
-            (SELECT margin_pct FROM monthly ORDER BY month LIMIT 1) AS first_month,
-            (SELECT margin_pct FROM monthly ORDER BY month DESC LIMIT 1) AS last_month
+            (ARRAY_AGG(margin_pct ORDER BY month))[1] AS first_month,
+            (ARRAY_AGG(margin_pct ORDER BY month DESC))[1] AS last_month
+        FROM monthly
         """
-        result = self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to)
+
+    def _parse_margin_trend(self, result: list) -> Trend:
         if result and result[0]['first_month'] and result[0]['last_month']:
             return self._calculate_trend(result[0]['last_month'], result[0]['first_month'])
         return Trend.FLAT
 
     def _get_returns_summary(self, date_from: str, date_to: str) -> dict:
         """Get returns summary from cfo_views.returns_impact."""
+        return self._parse_returns_summary(
+            self.db.execute_query(*self._returns_summary_query(date_from, date_to))
+        )
+
+    def _returns_summary_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             SUM(return_count) AS total_returns,
@@ -246,7 +399,9 @@ class CFOAgentV2(BaseAgent):
         WHERE return_date BETWEEN %s AND %s
         """
         self._add_evidence("cfo_views.returns_impact", f"return_date between '{date_from}' and '{date_to}'")
-        result = self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to)
+
+    def _parse_returns_summary(self, result: list) -> dict:
         if result:
             return {
                 'total_returns': result[0].get('total_returns', 0) or 0,
@@ -257,6 +412,13 @@ class CFOAgentV2(BaseAgent):
 
     def _get_inventory_value(self) -> dict:
         """Get inventory value from cfo_views.inventory_value."""
+        return self._parse_inventory_value(self.db.execute_query(*self._inventory_value_query()))
+
+    def _inventory_value_query(self) -> tuple:
+        if self._inventory_summary_available:
+            self._add_evidence("cfo_views.inventory_value_summary", "current inventory valuation")
+            return "SELECT total_units, cost_value, retail_value FROM cfo_views.inventory_value_summary", None
+
         query = """
         SELECT
             SUM(total_on_hand) AS total_units,
@@ -265,7 +427,9 @@ class CFOAgentV2(BaseAgent):
         FROM cfo_views.inventory_value
         """
         self._add_evidence("cfo_views.inventory_value", "current inventory valuation")
-        result = self.db.execute_query(query)
+        return query, None
+
+    def _parse_inventory_value(self, result: list) -> dict:
         if result:
             return {
                 'total_units': result[0].get('total_units', 0) or 0,
@@ -274,89 +438,80 @@ class CFOAgentV2(BaseAgent):
             }
         return {'cost_value': 0}
 
-    def _generate_insights(self, pnl_data: dict, discount_data: dict,
+    def _generate_insights(self, pnl_data: PnlSummary, discount_data: dict,
                           date_from: str, date_to: str) -> list:
         """Generate CFO insights from allowed views."""
         insights = []
 
         # P&L insight
-        margin_pct = (pnl_data['gross_profit'] / max(pnl_data['net_revenue'], 1)) * 100
-        insights.append(
-            f"Gross margin at {margin_pct:.1f}% with net revenue of ${pnl_data['net_revenue']:,.0f}."
-        )
+        insights.append(_INSIGHT_MARGIN.format(pnl=pnl_data))
 
         # Discount insight
         discount_rate = discount_data.get('discount_rate', 0)
         if discount_rate > 5:
-            insights.append(f"Discount rate of {discount_rate:.1f}% impacting margins.")
+            insights.append(_INSIGHT_DISCOUNT_HIGH.format(discount_rate))
         else:
-            insights.append(f"Discount rate controlled at {discount_rate:.1f}%.")
+            insights.append(_INSIGHT_DISCOUNT_OK.format(discount_rate))
 
         # COGS insight
-        cogs_pct = (pnl_data['cogs'] / max(pnl_data['net_revenue'], 1)) * 100
-        insights.append(f"COGS represents {cogs_pct:.1f}% of net revenue.")
+        insights.append(_INSIGHT_COGS.format(pnl=pnl_data))
 
         return insights
 
-    def _identify_risks(self, pnl_data: dict, discount_data: dict,
-                       date_from: str, date_to: str) -> list:
+    def _identify_risks(self, pnl_data: PnlSummary, returns_data: dict,
+                       low_margin_cats: list) -> list:
         """Identify financial risks from allowed views."""
         risks = []
 
-        margin_pct = (pnl_data['gross_profit'] / max(pnl_data['net_revenue'], 1)) * 100
+        margin_pct = pnl_data.margin_pct
 
         if margin_pct < 20:
-            risks.append(f"Margin at {margin_pct:.1f}% is below 20% target threshold.")
+            risks.append(_RISK_MARGIN_BELOW_TARGET.format(margin_pct))
 
         if margin_pct < 18:
-            risks.append("Critical: Margin approaching floor level. Immediate review needed.")
+            risks.append(_RISK_MARGIN_CRITICAL)
 
         # Returns risk
-        returns_data = self._get_returns_summary(date_from, date_to)
-        return_pct = (returns_data['total_refund'] / max(pnl_data['net_revenue'], 1)) * 100
+        return_pct = (returns_data['total_refund'] / max(pnl_data.net_revenue, 1)) * 100
         if return_pct > 3:
-            risks.append(f"Returns at {return_pct:.1f}% of revenue - above 3% threshold.")
+            risks.append(_RISK_RETURNS.format(return_pct))
 
-        # Category margin risk
-        low_margin_cats = self._get_margin_by_category(date_from, date_to)
-        if low_margin_cats and low_margin_cats[0].get('margin_pct', 100) < 15:
-            risks.append(
-                f"Low margin in {low_margin_cats[0]['category_name']}: "
-                f"{low_margin_cats[0]['margin_pct']:.1f}%"
-            )
+        # Category margin risk; the query only returns a category below the floor
+        if low_margin_cats:
+            risks.append(_RISK_CATEGORY.format_map(low_margin_cats[0]))
 
         if not risks:
-            risks.append("Financial metrics within acceptable ranges.")
+            risks.append(_RISK_NONE)
 
         return risks
 
-    def _generate_recommendations(self, pnl_data: dict, discount_data: dict) -> list:
+    def _generate_recommendations(self, pnl_data: PnlSummary, discount_data: dict,
+                                  inv_data: dict) -> list:
         """Generate CFO recommendations from allowed view data."""
         recommendations = []
 
-        margin_pct = (pnl_data['gross_profit'] / max(pnl_data['net_revenue'], 1)) * 100
+        margin_pct = pnl_data.margin_pct
         discount_rate = discount_data.get('discount_rate', 0)
 
         if margin_pct < 25:
             recommendations.append(Recommendation(
                 action="Review category-level pricing to improve overall margin",
-                impact=f"Target margin increase from {margin_pct:.1f}% toward 25%",
+                impact=_IMPACT_MARGIN.format(margin_pct),
                 priority="High" if margin_pct < 20 else "Medium"
             ))
 
         if discount_rate > 5:
             recommendations.append(Recommendation(
                 action="Implement discount caps on low-margin categories",
-                impact=f"Reduce discount rate from {discount_rate:.1f}% to protect margins",
+                impact=_IMPACT_DISCOUNT.format(discount_rate),
                 priority="High"
             ))
 
         # Inventory recommendation
-        inv_data = self._get_inventory_value()
         if inv_data['cost_value'] > 0:
             recommendations.append(Recommendation(
                 action="Optimize inventory levels to improve working capital",
-                impact=f"Current inventory at ${inv_data['cost_value']:,.0f} cost value",
+                impact=_IMPACT_INVENTORY.format_map(inv_data),
                 priority="Medium"
             ))
 
@@ -11,6 +11,18 @@ from .contract import (
     Trend, Confidence
 )
 
+# Key tables whose row counts are reported
+_RECORD_COUNT_TABLES = (
+    'pos_transaction', 'pos_transaction_line', 'sku', 'product',
+    'store', 'store_inventory', 'customer', 'purchase_order'
+)
+
+# All record counts in one statement
+_SQL_RECORD_COUNTS = "\nUNION ALL\n".join(
+    f"SELECT '{table}' AS table_name, COUNT(*) AS cnt FROM retail.{table}"
+    for table in _RECORD_COUNT_TABLES
+)
+
 
 class CIOAgent(BaseAgent):
     """
@@ -35,12 +47,23 @@ class CIOAgent(BaseAgent):
 
         window = f"{date_from} to {date_to}"
 
+        # The four reads are independent and come from one round-trip
+        health_data, count_rows, inventory_rows, freshness_rows = self.db.execute_many_queries([
+            self._health_check_results_query(),
+            self._record_counts_query(),
+            self._inventory_coverage_query(),
+            self._data_freshness_query(),
+        ])
+        record_counts = self._parse_record_counts(count_rows)
+        inventory_data = self._parse_inventory_coverage(inventory_rows)
+        freshness = self._parse_data_freshness(freshness_rows)
+
         # Calculate KPIs
         kpis = []
 
-        # 1. Data Health Score
-        health_data = self._get_health_check_results()
-        health_score = self._calculate_health_score(health_data)
+        # 1. Data Health Score; the buckets are shared by every consumer below
+        health = self._bucket_health(health_data)
+        health_score = health['score']
         kpis.append(KPI(
             name="Data Health Score",
             value=health_score,
@@ -50,7 +73,6 @@ class CIOAgent(BaseAgent):
         ))
 
         # 2. Record Count
-        record_counts = self._get_record_counts()
         total_records = sum(record_counts.values())
         kpis.append(KPI(
             name="Total Records",
@@ -61,7 +83,6 @@ class CIOAgent(BaseAgent):
         ))
 
         # 3. Inventory Coverage
-        inventory_data = self._get_inventory_coverage()
         kpis.append(KPI(
             name="Inventory Coverage",
             value=round(inventory_data['coverage_pct'], 1),
@@ -71,7 +92,6 @@ class CIOAgent(BaseAgent):
         ))
 
         # 4. Data Freshness (days since last transaction)
-        freshness = self._get_data_freshness()
         kpis.append(KPI(
             name="Data Freshness",
             value=freshness['days_since_last_txn'],
@@ -81,13 +101,13 @@ class CIOAgent(BaseAgent):
         ))
 
         # Generate insights
-        insights = self._generate_insights(health_data, record_counts, inventory_data)
+        insights = self._generate_insights(health, record_counts, inventory_data)
 
         # Identify risks
-        risks = self._identify_risks(health_data, freshness)
+        risks = self._identify_risks(health, freshness)
 
         # Generate recommendations
-        recommendations = self._generate_recommendations(health_data, inventory_data)
+        recommendations = self._generate_recommendations(health, inventory_data)
 
         # Determine confidence based on health score
         if health_score >= 90:
@@ -109,13 +129,14 @@ class CIOAgent(BaseAgent):
 
     def _get_health_check_results(self) -> list:
         """Get latest health check results."""
+        return self.db.execute_query(*self._health_check_results_query())
+
+    def _health_check_results_query(self) -> tuple:
         query = """
         SELECT
             check_name,
             status,
-            metric_value,
-            details,
-            run_ts
+            details
         FROM retail.data_health_checks
         WHERE run_ts = (SELECT MAX(run_ts) FROM retail.data_health_checks)
         ORDER BY check_name
@@ -124,42 +145,66 @@ class CIOAgent(BaseAgent):
             "retail.data_health_checks",
             "latest run_ts"
         )
-        return self.db.execute_query(query)
+        return query, None
 
-    def _calculate_health_score(self, health_data: list) -> float:
+    def _calculate_health_score(self, health_data) -> float:
         """Calculate overall health score from individual checks."""
-        if not health_data:
-            return 0.0
+        return self._bucket_health(health_data)['score']
 
-        total_checks = len(health_data)
-        passed = sum(1 for h in health_data if h['status'] == 'PASS')
-        warned = sum(1 for h in health_data if h['status'] == 'WARN')
+    def _bucket_health(self, health_data) -> dict:
+        """
+        Sort health checks by status in a single pass.
+
+        health_data may be any iterable of rows, including a stream from
+        execute_query_iter. Returns the check count, passed count, the
+        WARN and FAIL rows, and the overall score.
+        """
+        total = passed = 0
+        warned, failed = [], []
+        for h in health_data:
+            total += 1
+            status = h['status']
+            if status == 'PASS':
+                passed += 1
+            elif status == 'WARN':
+                warned.append(h)
+            elif status == 'FAIL':
+                failed.append(h)
 
         # PASS = 100%, WARN = 50%, FAIL = 0%
-        score = (passed * 100 + warned * 50) / total_checks
-        return round(score, 1)
+        score = round((passed * 100 + len(warned) * 50) / total, 1) if total else 0.0
+        return {
+            'total': total,
+            'passed': passed,
+            'warned': warned,
+            'failed': failed,
+            'score': score,
+        }
 
     def _get_record_counts(self) -> dict:
         """Get record counts for key tables."""
-        tables = [
-            'pos_transaction', 'pos_transaction_line', 'sku', 'product',
-            'store', 'store_inventory', 'customer', 'purchase_order'
-        ]
-
-        counts = {}
-        for table in tables:
-            query = f"SELECT COUNT(*) as cnt FROM retail.{table}"
-            result = self.db.execute_query(query)
-            counts[table] = result[0]['cnt'] if result else 0
+        return self._parse_record_counts(self.db.execute_query(*self._record_counts_query()))
 
+    def _record_counts_query(self) -> tuple:
         self._add_evidence(
             "retail.* (multiple tables)",
             "record counts"
         )
+        return _SQL_RECORD_COUNTS, None
+
+    def _parse_record_counts(self, result: list) -> dict:
+        counts = dict.fromkeys(_RECORD_COUNT_TABLES, 0)
+        for row in result:
+            counts[row['table_name']] = row['cnt']
         return counts
 
     def _get_inventory_coverage(self) -> dict:
         """Calculate inventory coverage metrics."""
+        return self._parse_inventory_coverage(
+            self.db.execute_query(*self._inventory_coverage_query())
+        )
+
+    def _inventory_coverage_query(self) -> tuple:
         query = """
         SELECT
             (SELECT COUNT(DISTINCT sku_id) FROM retail.store_inventory) as skus_in_inventory,
@@ -171,8 +216,9 @@ class CIOAgent(BaseAgent):
             "retail.store_inventory + retail.sku + retail.store",
             "inventory coverage calculation"
         )
-        result = self.db.execute_query(query)
+        return query, None
 
+    def _parse_inventory_coverage(self, result: list) -> dict:
         if result:
             data = result[0]
             active_skus = data['active_skus'] or 1
@@ -188,6 +234,9 @@ class CIOAgent(BaseAgent):
 
     def _get_data_freshness(self) -> dict:
         """Calculate data freshness metrics."""
+        return self._parse_data_freshness(self.db.execute_query(*self._data_freshness_query()))
+
+    def _data_freshness_query(self) -> tuple:
         query = """
         SELECT
             MAX(txn_ts)::date as last_txn_date,
@@ -199,8 +248,9 @@ class CIOAgent(BaseAgent):
             "retail.pos_transaction",
             "data freshness check"
         )
-        result = self.db.execute_query(query)
+        return query, None
 
+    def _parse_data_freshness(self, result: list) -> dict:
         if result and result[0]['last_txn_date']:
             return {
                 'last_txn_date': result[0]['last_txn_date'],
@@ -211,27 +261,20 @@ class CIOAgent(BaseAgent):
 
     def _get_referential_integrity(self) -> dict:
         """Check referential integrity across key relationships."""
-        checks = {}
-
-        # Check for orphan transaction lines
-        query = """
-        SELECT COUNT(*) as cnt
-        FROM retail.pos_transaction_line ptl
-        LEFT JOIN retail.pos_transaction pt ON pt.txn_id = ptl.txn_id
-        WHERE pt.txn_id IS NULL
-        """
-        result = self.db.execute_query(query)
-        checks['orphan_txn_lines'] = result[0]['cnt'] if result else 0
-
-        # Check for orphan SKUs
+        # Both orphan counts in one round-trip. NOT EXISTS plans as an
+        # anti-join that probes the parent's primary key per child row.
         query = """
-        SELECT COUNT(*) as cnt
-        FROM retail.sku s
-        LEFT JOIN retail.product p ON p.product_id = s.product_id
-        WHERE p.product_id IS NULL
+        SELECT
+            (SELECT COUNT(*) FROM retail.pos_transaction_line ptl
+             WHERE NOT EXISTS (
+                 SELECT 1 FROM retail.pos_transaction pt WHERE pt.txn_id = ptl.txn_id
+             )) AS orphan_txn_lines,
+            (SELECT COUNT(*) FROM retail.sku s
+             WHERE NOT EXISTS (
+                 SELECT 1 FROM retail.product p WHERE p.product_id = s.product_id
+             )) AS orphan_skus
         """
-        result = self.db.execute_query(query)
-        checks['orphan_skus'] = result[0]['cnt'] if result else 0
+        checks = self.db.execute_query(query)[0]
 
         self._add_evidence(
             "retail.pos_transaction_line + retail.sku",
@@ -239,16 +282,14 @@ class CIOAgent(BaseAgent):
         )
         return checks
 
-    def _generate_insights(self, health_data: list, record_counts: dict, inventory_data: dict) -> list:
+    def _generate_insights(self, health: dict, record_counts: dict, inventory_data: dict) -> list:
         """Generate CIO insights from the data."""
         insights = []
 
         # Health check summary
-        if health_data:
-            passed = sum(1 for h in health_data if h['status'] == 'PASS')
-            total = len(health_data)
+        if health['total']:
             insights.append(
-                f"Data health: {passed}/{total} checks passing."
+                f"Data health: {health['passed']}/{health['total']} checks passing."
             )
 
         # Record volume insight
@@ -266,15 +307,13 @@ class CIOAgent(BaseAgent):
 
         return insights
 
-    def _identify_risks(self, health_data: list, freshness: dict) -> list:
+    def _identify_risks(self, health: dict, freshness: dict) -> list:
         """Identify data/system risks."""
         risks = []
 
         # Check for failed health checks
-        if health_data:
-            failed = [h for h in health_data if h['status'] == 'FAIL']
-            for f in failed[:2]:  # Report top 2 failures
-                risks.append(f"FAIL: {f['check_name']} - {f['details']}")
+        for f in health['failed'][:2]:  # Report top 2 failures
+            risks.append(f"FAIL: {f['check_name']} - {f['details']}")
 
         # Check data freshness
         days_old = freshness.get('days_since_last_txn', 0)
@@ -293,28 +332,24 @@ class CIOAgent(BaseAgent):
 
         return risks
 
-    def _generate_recommendations(self, health_data: list, inventory_data: dict) -> list:
+    def _generate_recommendations(self, health: dict, inventory_data: dict) -> list:
         """Generate CIO recommendations."""
         recommendations = []
 
         # Health check remediation
-        if health_data:
-            failed = [h for h in health_data if h['status'] == 'FAIL']
-            warned = [h for h in health_data if h['status'] == 'WARN']
-
-            if failed:
-                recommendations.append(Recommendation(
-                    action=f"Remediate {len(failed)} failing data health checks",
-                    impact="Restore data integrity and agent reliability",
-                    priority="High"
-                ))
-
-            if warned:
-                recommendations.append(Recommendation(
-                    action=f"Investigate {len(warned)} warning-level health checks",
-                    impact="Prevent potential data quality degradation",
-                    priority="Medium"
-                ))
+        if health['failed']:
+            recommendations.append(Recommendation(
+                action=f"Remediate {len(health['failed'])} failing data health checks",
+                impact="Restore data integrity and agent reliability",
+                priority="High"
+            ))
+
+        if health['warned']:
+            recommendations.append(Recommendation(
+                action=f"Investigate {len(health['warned'])} warning-level health checks",
+                impact="Prevent potential data quality degradation",
+                priority="Medium"
+            ))
 
         # Inventory coverage
         coverage = inventory_data.get('coverage_pct', 0)
@@ -337,68 +372,50 @@ class CIOAgent(BaseAgent):
 
     def run_health_checks(self) -> None:
         """Run and persist health checks to the data_health_checks table."""
+        # Each count is computed once in a single statement, then fanned
+        # out into one row per check
         query = """
+        WITH counts AS (
+            SELECT
+                (SELECT COUNT(*) FROM retail.sku s
+                 WHERE NOT EXISTS (
+                     SELECT 1 FROM retail.product p WHERE p.product_id = s.product_id
+                 )) AS orphan_skus,
+                (SELECT COUNT(*) FROM retail.pos_transaction_line
+                 WHERE unit_price IS NULL OR unit_price < 0) AS bad_prices,
+                (SELECT COUNT(*) FROM retail.store_inventory
+                 WHERE on_hand_qty < 0) AS negative_inventory,
+                (SELECT COUNT(*) FROM retail.pos_transaction
+                 WHERE txn_ts >= CURRENT_DATE - INTERVAL '30 days') AS recent_txns,
+                (SELECT COUNT(*) FROM retail.purchase_order_line pol
+                 WHERE NOT EXISTS (
+                     SELECT 1 FROM retail.sku s WHERE s.sku_id = pol.sku_id
+                 )) AS bad_po_lines
+        )
         INSERT INTO retail.data_health_checks (check_name, status, metric_value, details)
-
-        -- Check 1: Orphan SKUs
-        SELECT
-            'orphan_skus' AS check_name,
-            CASE WHEN COUNT(*) = 0 THEN 'PASS' ELSE 'FAIL' END AS status,
-            COUNT(*) AS metric_value,
-            'SKUs without matching products' AS details
-        FROM retail.sku s
-        LEFT JOIN retail.product p ON s.product_id = p.product_id
-        WHERE p.product_id IS NULL
-
-        UNION ALL
-
-        -- Check 2: Bad prices in transactions
-        SELECT
-            'bad_transaction_prices',
-            CASE WHEN COUNT(*) = 0 THEN 'PASS' ELSE 'FAIL' END,
-            COUNT(*),
-            'Transaction lines with null or negative unit_price'
-        FROM retail.pos_transaction_line
-        WHERE unit_price IS NULL OR unit_price < 0
-
-        UNION ALL
-
-        -- Check 3: Negative inventory
-        SELECT
-            'negative_inventory',
-            CASE WHEN COUNT(*) = 0 THEN 'PASS' ELSE 'FAIL' END,
-            COUNT(*),
-            'Store inventory records with negative on_hand_qty'
-        FROM retail.store_inventory
-        WHERE on_hand_qty < 0
-
-        UNION ALL
-
-        -- Check 4: Data freshness
         SELECT
-            'data_freshness',
-            CASE WHEN COUNT(*) > 0 THEN 'PASS' ELSE 'WARN' END,
-            COUNT(*),
-            'Transactions in last 30 days'
-        FROM retail.pos_transaction
-        WHERE txn_ts >= CURRENT_DATE - INTERVAL '30 days'
-
-        UNION ALL
-
-        -- Check 5: Referential integrity - PO lines
-        SELECT
-            'po_line_integrity',
-            CASE WHEN COUNT(*) = 0 THEN 'PASS' ELSE 'FAIL' END,
-            COUNT(*),
-            'PO lines with invalid SKU references'
-        FROM retail.purchase_order_line pol
-        LEFT JOIN retail.sku s ON pol.sku_id = s.sku_id
-        WHERE s.sku_id IS NULL;
+            v.check_name,
+            CASE WHEN v.passed THEN 'PASS' ELSE v.fail_status END,
+            v.metric_value,
+            v.details
+        FROM counts c
+        CROSS JOIN LATERAL (VALUES
+            ('orphan_skus', c.orphan_skus, c.orphan_skus = 0, 'FAIL',
+             'SKUs without matching products'),
+            ('bad_transaction_prices', c.bad_prices, c.bad_prices = 0, 'FAIL',
+             'Transaction lines with null or negative unit_price'),
+            ('negative_inventory', c.negative_inventory, c.negative_inventory = 0, 'FAIL',
+             'Store inventory records with negative on_hand_qty'),
+            ('data_freshness', c.recent_txns, c.recent_txns > 0, 'WARN',
+             'Transactions in last 30 days'),
+            ('po_line_integrity', c.bad_po_lines, c.bad_po_lines = 0, 'FAIL',
+             'PO lines with invalid SKU references')
+        ) AS v(check_name, metric_value, passed, fail_status, details);
         """
-        conn = self.db.connect()
-        with conn.cursor() as cur:
-            cur.execute(query)
-        conn.commit()
+        self.db.execute_write(query)
+
+        # Cached agent results and query rows predate these checks
+        self.invalidate()
 
 
 # CLI interface
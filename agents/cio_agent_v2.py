@@ -12,6 +12,58 @@ from .contract import (
     Trend, Confidence
 )
 
+# Views read on every analyze(): view -> (query, evidence filters)
+_VIEW_QUERIES = {
+    'health_check_status': (
+        """
+        SELECT
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE status = 'PASS') AS passed,
+            COUNT(*) FILTER (WHERE status = 'WARN') AS warned,
+            COUNT(*) FILTER (WHERE status = 'FAIL') AS failed
+        FROM cio_views.health_check_status
+        """, "latest health checks"),
+    'health_failures': (
+        """
+        SELECT check_name, details
+        FROM cio_views.health_check_status
+        WHERE status = 'FAIL'
+        ORDER BY check_name
+        LIMIT 2
+        """, "failing health checks"),
+    'table_counts': (
+        "SELECT table_name, row_count FROM cio_views.table_counts", "all monitored tables"),
+    'inventory_coverage': (
+        "SELECT sku_coverage_pct FROM cio_views.inventory_coverage", "inventory data coverage"),
+    # Only the stalest table is reported, as the KPI and as the staleness risk
+    'data_freshness': (
+        """
+        SELECT table_name, days_since_update
+        FROM cio_views.data_freshness
+        ORDER BY days_since_update DESC NULLS LAST
+        LIMIT 1
+        """, "transaction table freshness"),
+    # Only violating rows, and only the first of each kind is reported
+    'integrity_quality_issues': (
+        """
+        (SELECT 'integrity' AS kind, description, violation_count AS cnt
+         FROM cio_views.referential_integrity
+         WHERE violation_count > 0
+         LIMIT 1)
+        UNION ALL
+        (SELECT 'quality', description, issue_count
+         FROM cio_views.data_quality
+         WHERE issue_count > 0
+         LIMIT 1)
+        """, "integrity violations and quality issues"),
+}
+
+# Entries not named after the view(s) they read: entry -> views cited as evidence
+_EVIDENCE_VIEWS = {
+    'health_failures': ('health_check_status',),
+    'integrity_quality_issues': ('referential_integrity', 'data_quality'),
+}
+
 
 class CIOAgentV2(BaseAgent):
     """
@@ -65,60 +117,63 @@ class CIOAgentV2(BaseAgent):
 
         window = "Current"
 
+        # Every view below comes from one round-trip
+        views = self._fetch_all_views()
+        health_counts = views['health_check_status'][0]
+        health_failures = views['health_failures']
+        record_counts = self._parse_table_counts(views['table_counts'])
+        coverage_data = views['inventory_coverage'][0] if views['inventory_coverage'] else {}
+        stalest = views['data_freshness'][0] if views['data_freshness'] else {}
+
+        health_score = self._calculate_health_score(health_counts)
+        max_days = stalest.get('days_since_update') or 0
+
         # Calculate KPIs from allowed views
-        kpis = []
-
-        # 1. Data Health Score from health check status
-        health_data = self._get_health_status()
-        health_score = self._calculate_health_score(health_data)
-        kpis.append(KPI(
-            name="Data Health Score",
-            value=health_score,
-            unit="%",
-            trend=Trend.UP if health_score >= 90 else Trend.FLAT,
-            window=window
-        ))
-
-        # 2. Total Records from table counts
-        record_counts = self._get_table_counts()
-        total_records = sum(r.get('row_count', 0) for r in record_counts)
-        kpis.append(KPI(
-            name="Total Records",
-            value=total_records,
-            unit="records",
-            trend=Trend.FLAT,
-            window=window
-        ))
-
-        # 3. Inventory Coverage from inventory coverage view
-        coverage_data = self._get_inventory_coverage()
-        kpis.append(KPI(
-            name="SKU Coverage",
-            value=round(coverage_data.get('sku_coverage_pct', 0), 1),
-            unit="%",
-            trend=Trend.FLAT,
-            window=window
-        ))
-
-        # 4. Data Freshness from data freshness view
-        freshness_data = self._get_data_freshness()
-        max_days = max((f.get('days_since_update', 0) or 0) for f in freshness_data) if freshness_data else 0
-        kpis.append(KPI(
-            name="Data Freshness",
-            value=max_days,
-            unit="days",
-            trend=Trend.DOWN if max_days > 7 else Trend.UP,
-            window=window
-        ))
+        kpis = [
+            # 1. Data Health Score from health check status
+            KPI(
+                name="Data Health Score",
+                value=health_score,
+                unit="%",
+                trend=Trend.UP if health_score >= 90 else Trend.FLAT,
+                window=window
+            ),
+            # 2. Total Records from table counts
+            KPI(
+                name="Total Records",
+                value=sum(record_counts.values()),
+                unit="records",
+                trend=Trend.FLAT,
+                window=window
+            ),
+            # 3. Inventory Coverage from inventory coverage view
+            KPI(
+                name="SKU Coverage",
+                value=round(coverage_data.get('sku_coverage_pct', 0), 1),
+                unit="%",
+                trend=Trend.FLAT,
+                window=window
+            ),
+            # 4. Data Freshness from data freshness view
+            KPI(
+                name="Data Freshness",
+                value=max_days,
+                unit="days",
+                trend=Trend.DOWN if max_days > 7 else Trend.UP,
+                window=window
+            ),
+        ]
 
         # Generate insights
-        insights = self._generate_insights(health_data, record_counts, coverage_data)
+        insights = self._generate_insights(health_counts, record_counts, coverage_data)
 
         # Identify risks
-        risks = self._identify_risks(health_data, freshness_data)
+        risks = self._identify_risks(
+            health_failures, stalest, views['integrity_quality_issues']
+        )
 
         # Generate recommendations
-        recommendations = self._generate_recommendations(health_data, coverage_data)
+        recommendations = self._generate_recommendations(health_counts, coverage_data)
 
         # Determine confidence
         if health_score >= 90:
@@ -138,63 +193,74 @@ class CIOAgentV2(BaseAgent):
             confidence=confidence
         )
 
-    def _get_health_status(self) -> list:
-        """Get current health check status from cio_views.health_check_status."""
-        query = "SELECT * FROM cio_views.health_check_status"
-        self._add_evidence("cio_views.health_check_status", "latest health checks")
-        return self.db.execute_query(query)
+    def _fetch_all_views(self) -> dict:
+        """
+        Read every view in _VIEW_QUERIES in a single round-trip.
 
-    def _calculate_health_score(self, health_data: list) -> float:
-        """Calculate overall health score."""
-        if not health_data:
+        Returns {view name: rows}.
+        """
+        names = list(_VIEW_QUERIES)
+        results = self.db.execute_many_queries(
+            [(_VIEW_QUERIES[name][0], None) for name in names]
+        )
+        for name in names:
+            self._add_view_evidence(name)
+        return dict(zip(names, results))
+
+    def _query_view(self, name: str) -> list:
+        """Read one view from _VIEW_QUERIES on its own."""
+        self._add_view_evidence(name)
+        return self.db.execute_query(_VIEW_QUERIES[name][0])
+
+    def _add_view_evidence(self, name: str) -> None:
+        """Cite the view(s) behind a _VIEW_QUERIES entry."""
+        filters = _VIEW_QUERIES[name][1]
+        for view in _EVIDENCE_VIEWS.get(name, (name,)):
+            self._add_evidence(f"cio_views.{view}", filters)
+
+    def _get_health_status(self) -> dict:
+        """Get health check counts by status from cio_views.health_check_status."""
+        return self._query_view('health_check_status')[0]
+
+    def _calculate_health_score(self, health_counts: dict) -> float:
+        """Calculate overall health score from per-status check counts."""
+        if not health_counts['total']:
             return 0.0
 
-        total = len(health_data)
-        passed = sum(1 for h in health_data if h.get('status') == 'PASS')
-        warned = sum(1 for h in health_data if h.get('status') == 'WARN')
-
-        score = (passed * 100 + warned * 50) / total
+        score = (health_counts['passed'] * 100 + health_counts['warned'] * 50) / health_counts['total']
         return round(score, 1)
 
     def _get_health_history(self, days: int = 7) -> list:
         """Get health check history from cio_views.health_check_history."""
-        query = f"""
+        # No LIMIT: the guardrail's automatic max_rows limit applies
+        query = """
         SELECT * FROM cio_views.health_check_history
+        WHERE check_date >= CURRENT_DATE - %s::int
         ORDER BY check_date DESC
-        LIMIT {days}
         """
         self._add_evidence("cio_views.health_check_history", f"last {days} days")
-        return self.db.execute_query(query)
+        return self.db.execute_query(query, (int(days),))
 
-    def _get_table_counts(self) -> list:
+    def _get_table_counts(self) -> dict:
         """Get table record counts from cio_views.table_counts."""
-        query = "SELECT * FROM cio_views.table_counts ORDER BY row_count DESC"
-        self._add_evidence("cio_views.table_counts", "all monitored tables")
-        return self.db.execute_query(query)
+        return self._parse_table_counts(self._query_view('table_counts'))
 
-    def _get_data_freshness(self) -> list:
-        """Get data freshness from cio_views.data_freshness."""
-        query = "SELECT * FROM cio_views.data_freshness ORDER BY days_since_update DESC"
-        self._add_evidence("cio_views.data_freshness", "transaction table freshness")
-        return self.db.execute_query(query)
+    def _parse_table_counts(self, result: list) -> dict:
+        """Index table_counts rows as {table_name: row_count}."""
+        return {r['table_name']: r['row_count'] or 0 for r in result}
 
-    def _get_referential_integrity(self) -> list:
-        """Get referential integrity status from cio_views.referential_integrity."""
-        query = "SELECT * FROM cio_views.referential_integrity"
-        self._add_evidence("cio_views.referential_integrity", "integrity violation counts")
-        return self.db.execute_query(query)
+    def _get_data_freshness(self) -> dict:
+        """Get the least recently updated table from cio_views.data_freshness."""
+        result = self._query_view('data_freshness')
+        return result[0] if result else {}
 
-    def _get_data_quality(self) -> list:
-        """Get data quality metrics from cio_views.data_quality."""
-        query = "SELECT * FROM cio_views.data_quality"
-        self._add_evidence("cio_views.data_quality", "quality issue counts")
-        return self.db.execute_query(query)
+    def _get_integrity_and_quality_issues(self) -> list:
+        """Get violating rows from cio_views.referential_integrity and data_quality."""
+        return self._query_view('integrity_quality_issues')
 
     def _get_inventory_coverage(self) -> dict:
         """Get inventory coverage from cio_views.inventory_coverage."""
-        query = "SELECT * FROM cio_views.inventory_coverage"
-        self._add_evidence("cio_views.inventory_coverage", "inventory data coverage")
-        result = self.db.execute_query(query)
+        result = self._query_view('inventory_coverage')
         return result[0] if result else {}
 
     def _get_pipeline_health(self) -> list:
@@ -208,23 +274,21 @@ class CIOAgentV2(BaseAgent):
         query = "SELECT * FROM cio_views.available_views"
         return self.db.execute_query(query)
 
-    def _generate_insights(self, health_data: list, record_counts: list,
+    def _generate_insights(self, health_counts: dict, record_counts: dict,
                           coverage_data: dict) -> list:
         """Generate CIO insights from allowed views."""
         insights = []
 
         # Health check summary
-        if health_data:
-            passed = sum(1 for h in health_data if h.get('status') == 'PASS')
-            total = len(health_data)
-            insights.append(f"Data health: {passed}/{total} checks passing.")
+        if health_counts['total']:
+            insights.append(
+                f"Data health: {health_counts['passed']}/{health_counts['total']} checks passing."
+            )
 
         # Record counts
         if record_counts:
-            txn_records = next((r['row_count'] for r in record_counts
-                               if r['table_name'] == 'pos_transaction'), 0)
-            sku_records = next((r['row_count'] for r in record_counts
-                               if r['table_name'] == 'sku'), 0)
+            txn_records = record_counts.get('pos_transaction', 0)
+            sku_records = record_counts.get('sku', 0)
             insights.append(f"System contains {txn_records:,} transactions across {sku_records} SKUs.")
 
         # Coverage
@@ -233,64 +297,50 @@ class CIOAgentV2(BaseAgent):
 
         return insights
 
-    def _identify_risks(self, health_data: list, freshness_data: list) -> list:
+    def _identify_risks(self, health_failures: list, stalest: dict,
+                        issues: list) -> list:
         """Identify data/system risks from allowed views."""
         risks = []
 
-        # Failed health checks
-        if health_data:
-            failed = [h for h in health_data if h.get('status') == 'FAIL']
-            for f in failed[:2]:
-                risks.append(f"FAIL: {f['check_name']} - {f.get('details', 'No details')}")
+        # Failed health checks (the query returns at most two)
+        for f in health_failures:
+            risks.append(f"FAIL: {f['check_name']} - {f.get('details', 'No details')}")
 
         # Data freshness
-        if freshness_data:
-            stale = [f for f in freshness_data if (f.get('days_since_update') or 0) > 30]
-            for s in stale[:1]:
-                risks.append(
-                    f"Data staleness: {s['table_name']} not updated in "
-                    f"{s['days_since_update']} days."
-                )
-
-        # Referential integrity
-        integrity = self._get_referential_integrity()
-        violations = [i for i in integrity if (i.get('violation_count', 0) or 0) > 0]
-        for v in violations[:1]:
-            risks.append(f"Integrity issue: {v['violation_count']} {v['description']}")
-
-        # Data quality
-        quality = self._get_data_quality()
-        issues = [q for q in quality if (q.get('issue_count', 0) or 0) > 0]
-        for q in issues[:1]:
-            risks.append(f"Quality issue: {q['issue_count']} {q['description']}")
+        if (stalest.get('days_since_update') or 0) > 30:
+            risks.append(
+                f"Data staleness: {stalest['table_name']} not updated in "
+                f"{stalest['days_since_update']} days."
+            )
+
+        # Referential integrity and data quality (already filtered to count > 0)
+        for issue in issues:
+            label = "Integrity" if issue['kind'] == 'integrity' else "Quality"
+            risks.append(f"{label} issue: {issue['cnt']} {issue['description']}")
 
         if not risks:
             risks.append("All systems healthy. No critical data risks identified.")
 
         return risks
 
-    def _generate_recommendations(self, health_data: list, coverage_data: dict) -> list:
+    def _generate_recommendations(self, health_counts: dict, coverage_data: dict) -> list:
         """Generate CIO recommendations from allowed view data."""
         recommendations = []
 
         # Health check remediation
-        if health_data:
-            failed = [h for h in health_data if h.get('status') == 'FAIL']
-            warned = [h for h in health_data if h.get('status') == 'WARN']
-
-            if failed:
-                recommendations.append(Recommendation(
-                    action=f"Remediate {len(failed)} failing health checks immediately",
-                    impact="Restore data integrity for reliable agent insights",
-                    priority="High"
-                ))
-
-            if warned:
-                recommendations.append(Recommendation(
-                    action=f"Investigate {len(warned)} warning-level health checks",
-                    impact="Prevent potential data quality degradation",
-                    priority="Medium"
-                ))
+        if health_counts['failed']:
+            recommendations.append(Recommendation(
+                action=f"Remediate {health_counts['failed']} failing health checks immediately",
+                impact="Restore data integrity for reliable agent insights",
+                priority="High"
+            ))
+
+        if health_counts['warned']:
+            recommendations.append(Recommendation(
+                action=f"Investigate {health_counts['warned']} warning-level health checks",
+                impact="Prevent potential data quality degradation",
+                priority="Medium"
+            ))
 
         # Coverage improvement
         coverage_pct = coverage_data.get('sku_coverage_pct', 0)
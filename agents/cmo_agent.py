@@ -36,11 +36,19 @@ class CMOAgent(BaseAgent):
         filters = f"sale_date between '{date_from}' and '{date_to}'"
         window = f"{date_from} to {date_to}"
 
+        # Sales, promotion and category metrics come from one round-trip
+        sales_rows, promo_rows, category_data = self.db.execute_many_queries([
+            self._sales_metrics_query(date_from, date_to),
+            self._promotion_metrics_query(date_from, date_to),
+            self._category_performance_query(date_from, date_to),
+        ])
+        sales_data = self._parse_sales_metrics(sales_rows)
+        promo_data = self._parse_promotion_metrics(promo_rows)
+
         # Calculate KPIs
         kpis = []
 
         # 1. Total Units Sold
-        sales_data = self._get_sales_metrics(date_from, date_to)
         kpis.append(KPI(
             name="Units Sold",
             value=int(sales_data['total_units']),
@@ -54,12 +62,11 @@ class CMOAgent(BaseAgent):
             name="Avg Transaction Value",
             value=round(sales_data['avg_txn_value'], 2),
             unit="$",
-            trend=self._calculate_atv_trend(date_from, date_to),
+            trend=self._calculate_atv_trend(sales_data),
             window=window
         ))
 
         # 3. Promotion Performance
-        promo_data = self._get_promotion_metrics(date_from, date_to)
         kpis.append(KPI(
             name="Active Promotions",
             value=promo_data['active_promos'],
@@ -69,7 +76,6 @@ class CMOAgent(BaseAgent):
         ))
 
         # 4. Top Category Growth
-        category_data = self._get_category_performance(date_from, date_to)
         if category_data:
             top_category = category_data[0]
             kpis.append(KPI(
@@ -101,51 +107,80 @@ class CMOAgent(BaseAgent):
 
     def _get_sales_metrics(self, date_from: str, date_to: str) -> dict:
         """Calculate overall sales metrics."""
+        return self._parse_sales_metrics(
+            self.db.execute_query(*self._sales_metrics_query(date_from, date_to))
+        )
+
+    def _sales_metrics_query(self, date_from: str, date_to: str) -> tuple:
+        """
+        Overall sales metrics, average transaction value and the first/last
+        month ATV for the trend in one query.
+
+        pos_transaction is scanned once: monthly sums and counts feed both
+        the period ATV and the monthly trend.
+        """
         query = """
-        SELECT
-            SUM(units_sold) as total_units,
-            SUM(gross_revenue) as gross_revenue,
-            SUM(net_revenue) as net_revenue,
-            COUNT(DISTINCT sale_date) as trading_days,
-            COUNT(DISTINCT store_id) as active_stores
-        FROM retail.v_sales_daily_store_category
-        WHERE sale_date BETWEEN %s AND %s
+        WITH sales_agg AS (
+            SELECT
+                SUM(units_sold) AS total_units,
+                SUM(gross_revenue) AS gross_revenue,
+                SUM(net_revenue) AS net_revenue,
+                COUNT(DISTINCT sale_date) AS trading_days,
+                COUNT(DISTINCT store_id) AS active_stores
+            FROM retail.v_sales_daily_store_category
+            WHERE sale_date BETWEEN %s AND %s
+        ),
+        monthly AS (
+            SELECT
+                DATE_TRUNC('month', txn_ts) AS month,
+                SUM(total_amount) AS amount,
+                COUNT(total_amount) AS priced_txns,
+                COUNT(*) AS txns
+            FROM retail.pos_transaction
+            WHERE txn_ts::date BETWEEN %s AND %s
+            GROUP BY DATE_TRUNC('month', txn_ts)
+        ),
+        txn_agg AS (
+            SELECT
+                SUM(amount) / NULLIF(SUM(priced_txns), 0) AS avg_txn_value,
+                SUM(txns) AS total_transactions,
+                (ARRAY_AGG(amount / NULLIF(priced_txns, 0) ORDER BY month))[1] AS atv_first_month,
+                (ARRAY_AGG(amount / NULLIF(priced_txns, 0) ORDER BY month DESC))[1] AS atv_last_month
+            FROM monthly
+        )
+        SELECT * FROM sales_agg CROSS JOIN txn_agg
         """
         self._add_evidence(
             "retail.v_sales_daily_store_category",
             f"sale_date between '{date_from}' and '{date_to}'"
         )
-        result = self.db.execute_query(query, (date_from, date_to))
-        data = result[0] if result else {}
-
-        # Get average transaction value
-        atv_query = """
-        SELECT
-            AVG(total_amount) as avg_txn_value,
-            COUNT(DISTINCT txn_id) as total_transactions
-        FROM retail.pos_transaction
-        WHERE txn_ts::date BETWEEN %s AND %s
-        """
         self._add_evidence(
             "retail.pos_transaction",
             f"txn_ts between '{date_from}' and '{date_to}'"
         )
-        atv_result = self.db.execute_query(atv_query, (date_from, date_to))
-        if atv_result:
-            data.update(atv_result[0])
+        return query, (date_from, date_to, date_from, date_to)
 
+    def _parse_sales_metrics(self, result: list) -> dict:
+        data = result[0]
         return {
-            'total_units': data.get('total_units', 0) or 0,
-            'gross_revenue': data.get('gross_revenue', 0) or 0,
-            'net_revenue': data.get('net_revenue', 0) or 0,
-            'trading_days': data.get('trading_days', 0) or 0,
-            'active_stores': data.get('active_stores', 0) or 0,
-            'avg_txn_value': data.get('avg_txn_value', 0) or 0,
-            'total_transactions': data.get('total_transactions', 0) or 0
+            'total_units': data['total_units'] or 0,
+            'gross_revenue': data['gross_revenue'] or 0,
+            'net_revenue': data['net_revenue'] or 0,
+            'trading_days': data['trading_days'] or 0,
+            'active_stores': data['active_stores'] or 0,
+            'avg_txn_value': data['avg_txn_value'] or 0,
+            'total_transactions': data['total_transactions'] or 0,
+            'atv_first_month': data['atv_first_month'],
+            'atv_last_month': data['atv_last_month']
         }
 
     def _get_promotion_metrics(self, date_from: str, date_to: str) -> dict:
         """Calculate promotion metrics."""
+        return self._parse_promotion_metrics(
+            self.db.execute_query(*self._promotion_metrics_query(date_from, date_to))
+        )
+
+    def _promotion_metrics_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             COUNT(DISTINCT p.promo_id) as active_promos,
@@ -159,7 +194,9 @@ class CMOAgent(BaseAgent):
             "retail.promotion + retail.promotion_sku",
             f"promotion period overlapping '{date_from}' to '{date_to}'"
         )
-        result = self.db.execute_query(query, (date_to, date_from))
+        return query, (date_to, date_from)
+
+    def _parse_promotion_metrics(self, result: list) -> dict:
         return {
             'active_promos': result[0].get('active_promos', 0) or 0 if result else 0,
             'promoted_skus': result[0].get('promoted_skus', 0) or 0 if result else 0,
@@ -168,12 +205,18 @@ class CMOAgent(BaseAgent):
 
     def _get_category_performance(self, date_from: str, date_to: str) -> list:
         """Get sales performance by category."""
+        return self.db.execute_query(*self._category_performance_query(date_from, date_to))
+
+    def _category_performance_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             category_name,
             SUM(units_sold) as units,
             SUM(gross_revenue) as revenue,
-            SUM(net_revenue) as net_revenue
+            SUM(net_revenue) as net_revenue,
+            COALESCE(
+                SUM(gross_revenue) * 100.0 / NULLIF(SUM(SUM(gross_revenue)) OVER (), 0), 0
+            ) as revenue_share
         FROM retail.v_sales_daily_store_category
         WHERE sale_date BETWEEN %s AND %s
         GROUP BY category_name
@@ -183,7 +226,7 @@ class CMOAgent(BaseAgent):
             "retail.v_sales_daily_store_category",
             f"sale_date between '{date_from}' and '{date_to}', grouped by category"
         )
-        return self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to)
 
     def _get_store_performance(self, date_from: str, date_to: str) -> list:
         """Get sales performance by store."""
@@ -228,25 +271,12 @@ class CMOAgent(BaseAgent):
         )
         return self.db.execute_query(query, (date_from, date_to))
 
-    def _calculate_atv_trend(self, date_from: str, date_to: str) -> Trend:
-        """Calculate average transaction value trend."""
-        query = """
-        WITH monthly AS (
-            SELECT
-                DATE_TRUNC('month', txn_ts) as month,
-                AVG(total_amount) as avg_txn
-            FROM retail.pos_transaction
-            WHERE txn_ts::date BETWEEN %s AND %s
-            GROUP BY DATE_TRUNC('month', txn_ts)
-            ORDER BY month
-        )
-        SELECT
-            (SELECT avg_txn FROM monthly ORDER BY month LIMIT 1) as first_month,
-            (SELECT avg_txn FROM monthly ORDER BY month DESC LIMIT 1) as last_month
-        """
-        result = self.db.execute_query(query, (date_from, date_to))
-        if result and result[0]['first_month'] and result[0]['last_month']:
-            return self._calculate_trend(result[0]['last_month'], result[0]['first_month'])
+    def _calculate_atv_trend(self, sales_data: dict) -> Trend:
+        """Calculate average transaction value trend from the sales metrics."""
+        first_month = sales_data['atv_first_month']
+        last_month = sales_data['atv_last_month']
+        if first_month and last_month:
+            return self._calculate_trend(last_month, first_month)
         return Trend.FLAT
 
     def _generate_insights(self, sales_data: dict, promo_data: dict, category_data: list) -> list:
@@ -282,8 +312,7 @@ class CMOAgent(BaseAgent):
 
         # Check for concentration risk
         if category_data:
-            total_revenue = sum(c.get('revenue', 0) for c in category_data)
-            top_category_share = (category_data[0].get('revenue', 0) / max(total_revenue, 1)) * 100
+            top_category_share = category_data[0]['revenue_share']
             if top_category_share > 30:
                 risks.append(
                     f"Revenue concentration: {category_data[0]['category_name']} "
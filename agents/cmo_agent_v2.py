@@ -6,6 +6,7 @@ NO access to individual customer data or raw transaction tables.
 """
 
 from typing import Optional
+import psycopg2
 from .base_agent import BaseAgent, DatabaseConnection, GuardrailedDatabaseConnection
 from .contract import (
     AgentOutput, AgentRole, KPI, Recommendation, Evidence,
@@ -25,6 +26,8 @@ class CMOAgentV2(BaseAgent):
     - cmo_views.basket_metrics
     - cmo_views.segment_performance
     - cmo_views.repeat_rate
+    - cmo_views.repeat_rate_summary (materialized, see performance_schema.sql)
+    - cmo_views.mv_refresh_log
     - cmo_views.category_mix_by_format
     - cmo_views.brand_performance
 
@@ -50,10 +53,26 @@ class CMOAgentV2(BaseAgent):
         'cmo_views.basket_metrics',
         'cmo_views.segment_performance',
         'cmo_views.repeat_rate',
+        'cmo_views.repeat_rate_summary',
+        'cmo_views.mv_refresh_log',
         'cmo_views.category_mix_by_format',
         'cmo_views.brand_performance',
     ]
 
+    # Average daily transactions below which volume is flagged as a risk
+    LOW_DAILY_TRANSACTIONS = 80
+
+    # The repeat rate summary is refreshed nightly; allow one missed refresh
+    STALE_AFTER_HOURS = 48
+
+    @property
+    def _repeat_summary_available(self) -> bool:
+        """
+        Read the precomputed cmo_views.repeat_rate_summary (see
+        performance_schema.sql) unless it was found missing on this database.
+        """
+        return self._feature_available('cmo_views.repeat_rate_summary') is not False
+
     def _get_role_name(self) -> str:
         """Return role name for guardrails initialization."""
         return "CMO"
@@ -71,11 +90,18 @@ class CMOAgentV2(BaseAgent):
 
         window = f"{date_from} to {date_to}"
 
+        # Every metric below comes from one round-trip
+        (sales_rows, basket_rows, trend_rows, promo_rows,
+         repeat_rows, segments) = self._fetch_metrics(date_from, date_to)
+        sales_data = self._parse_sales_summary(sales_rows)
+        basket_data = self._parse_basket_summary(basket_rows)
+        promo_data = self._parse_promo_summary(promo_rows)
+        repeat_data = self._parse_repeat_rate(repeat_rows)
+
         # Calculate KPIs from allowed views
         kpis = []
 
         # 1. Units Sold from sales demand
-        sales_data = self._get_sales_summary(date_from, date_to)
         kpis.append(KPI(
             name="Units Sold",
             value=int(sales_data['units_sold']),
@@ -85,17 +111,15 @@ class CMOAgentV2(BaseAgent):
         ))
 
         # 2. Average Basket Value from basket metrics
-        basket_data = self._get_basket_summary(date_from, date_to)
         kpis.append(KPI(
             name="Avg Basket Value",
             value=round(basket_data['avg_basket_value'], 2),
             unit="$",
-            trend=self._get_basket_trend(date_from, date_to),
+            trend=self._parse_basket_trend(trend_rows),
             window=window
         ))
 
         # 3. Active Promotions from promo coverage
-        promo_data = self._get_promo_summary(date_from, date_to)
         kpis.append(KPI(
             name="Active Promotions",
             value=promo_data['promo_count'],
@@ -105,7 +129,6 @@ class CMOAgentV2(BaseAgent):
         ))
 
         # 4. Repeat Purchase Rate
-        repeat_data = self._get_repeat_rate()
         kpis.append(KPI(
             name="Repeat Customers",
             value=round(repeat_data['repeat_pct'], 1),
@@ -115,13 +138,24 @@ class CMOAgentV2(BaseAgent):
         ))
 
         # Generate insights
-        insights = self._generate_insights(sales_data, basket_data, promo_data)
+        insights = self._generate_insights(sales_data, basket_data, promo_data, segments)
 
         # Identify risks
-        risks = self._identify_risks(sales_data, basket_data)
+        risks = self._identify_risks(sales_data, basket_data, repeat_data)
 
         # Generate recommendations
-        recommendations = self._generate_recommendations(sales_data, basket_data, promo_data)
+        recommendations = self._generate_recommendations(
+            sales_data, basket_data, promo_data, repeat_data
+        )
+
+        # A stale repeat rate summary makes the repeat KPI less reliable
+        hours = repeat_data.get('hours_since_refresh')
+        if sales_data['units_sold'] <= 0:
+            confidence = Confidence.LOW
+        elif hours is not None and hours > self.STALE_AFTER_HOURS:
+            confidence = Confidence.MEDIUM
+        else:
+            confidence = Confidence.HIGH
 
         return AgentOutput(
             agent=self.role,
@@ -130,9 +164,35 @@ class CMOAgentV2(BaseAgent):
             risks=risks[:3],
             recommendations=recommendations[:3],
             evidence=self._evidence,
-            confidence=Confidence.HIGH if sales_data['units_sold'] > 0 else Confidence.LOW
+            confidence=confidence
         )
 
+    def _fetch_metrics(self, date_from: str, date_to: str) -> list:
+        """
+        Run every analyze() query in a single batch.
+
+        If cmo_views.repeat_rate_summary has not been created yet, the
+        batch is retried once with repeat rate aggregated from
+        cmo_views.repeat_rate.
+        """
+        evidence_mark = len(self._evidence_raw)
+        try:
+            return self.db.execute_many_queries([
+                self._sales_summary_query(date_from, date_to),
+                self._basket_summary_query(date_from, date_to),
+                self._basket_trend_query(date_from, date_to),
+                self._promo_summary_query(date_from, date_to),
+                self._repeat_rate_query(),
+                # Only the top segment is reported
+                self._segment_performance_query(limit=1),
+            ])
+        except psycopg2.errors.UndefinedTable:
+            if not self._repeat_summary_available:
+                raise
+            self._set_feature_available('cmo_views.repeat_rate_summary', False)
+            del self._evidence_raw[evidence_mark:]
+            return self._fetch_metrics(date_from, date_to)
+
     def _get_date_range_from_sales(self) -> tuple:
         """Get date range from sales demand view."""
         query = """
@@ -146,6 +206,11 @@ class CMOAgentV2(BaseAgent):
 
     def _get_sales_summary(self, date_from: str, date_to: str) -> dict:
         """Get sales summary from cmo_views.sales_demand_category."""
+        return self._parse_sales_summary(
+            self.db.execute_query(*self._sales_summary_query(date_from, date_to))
+        )
+
+    def _sales_summary_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             SUM(units_sold) AS units_sold,
@@ -156,7 +221,9 @@ class CMOAgentV2(BaseAgent):
         WHERE sale_date BETWEEN %s AND %s
         """
         self._add_evidence("cmo_views.sales_demand_category", f"sale_date between '{date_from}' and '{date_to}'")
-        result = self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to)
+
+    def _parse_sales_summary(self, result: list) -> dict:
         if result:
             return {
                 'units_sold': result[0].get('units_sold', 0) or 0,
@@ -168,28 +235,42 @@ class CMOAgentV2(BaseAgent):
 
     def _get_basket_summary(self, date_from: str, date_to: str) -> dict:
         """Get basket metrics from cmo_views.basket_metrics."""
+        return self._parse_basket_summary(
+            self.db.execute_query(*self._basket_summary_query(date_from, date_to))
+        )
+
+    def _basket_summary_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             SUM(transaction_count) AS total_transactions,
             SUM(total_revenue) AS total_revenue,
             SUM(total_revenue) / NULLIF(SUM(transaction_count), 0) AS avg_basket_value,
-            AVG(avg_items_per_basket) AS avg_items_per_basket
+            AVG(avg_items_per_basket) AS avg_items_per_basket,
+            SUM(transaction_count)::float / GREATEST(%s::date - %s::date + 1, 1) AS daily_transactions
         FROM cmo_views.basket_metrics
         WHERE sale_date BETWEEN %s AND %s
         """
         self._add_evidence("cmo_views.basket_metrics", f"sale_date between '{date_from}' and '{date_to}'")
-        result = self.db.execute_query(query, (date_from, date_to))
+        return query, (date_to, date_from, date_from, date_to)
+
+    def _parse_basket_summary(self, result: list) -> dict:
         if result:
             return {
                 'total_transactions': result[0].get('total_transactions', 0) or 0,
                 'total_revenue': result[0].get('total_revenue', 0) or 0,
                 'avg_basket_value': result[0].get('avg_basket_value', 0) or 0,
-                'avg_items_per_basket': result[0].get('avg_items_per_basket', 0) or 0
+                'avg_items_per_basket': result[0].get('avg_items_per_basket', 0) or 0,
+                'daily_transactions': result[0].get('daily_transactions', 0) or 0
             }
-        return {'avg_basket_value': 0, 'total_transactions': 0}
+        return {'avg_basket_value': 0, 'total_transactions': 0, 'daily_transactions': 0}
 
     def _get_basket_trend(self, date_from: str, date_to: str) -> Trend:
         """Calculate basket value trend."""
+        return self._parse_basket_trend(
+            self.db.execute_query(*self._basket_trend_query(date_from, date_to))
+        )
+
+    def _basket_trend_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         WITH monthly AS (
             SELECT
@@ -198,29 +279,38 @@ class CMOAgentV2(BaseAgent):
             FROM cmo_views.basket_metrics
             WHERE sale_date BETWEEN %s AND %s
             GROUP BY DATE_TRUNC('month', sale_date)
-            ORDER BY month
         )
         SELECT
-            (SELECT avg_basket FROM monthly ORDER BY month LIMIT 1) AS first_month,
-            (SELECT avg_basket FROM monthly ORDER BY month DESC LIMIT 1) AS last_month
+            (ARRAY_AGG(avg_basket ORDER BY month))[1] AS first_month,
+            (ARRAY_AGG(avg_basket ORDER BY month DESC))[1] AS last_month
+        FROM monthly
         """
-        result = self.db.execute_query(query, (date_from, date_to))
+        return query, (date_from, date_to)
+
+    def _parse_basket_trend(self, result: list) -> Trend:
         if result and result[0]['first_month'] and result[0]['last_month']:
             return self._calculate_trend(result[0]['last_month'], result[0]['first_month'])
         return Trend.FLAT
 
     def _get_promo_summary(self, date_from: str, date_to: str) -> dict:
         """Get promotion summary from cmo_views.promo_coverage."""
+        return self._parse_promo_summary(
+            self.db.execute_query(*self._promo_summary_query(date_from, date_to))
+        )
+
+    def _promo_summary_query(self, date_from: str, date_to: str) -> tuple:
         query = """
         SELECT
             COUNT(*) AS promo_count,
             SUM(sku_count) AS total_sku_coverage,
             SUM(category_count) AS category_coverage
         FROM cmo_views.promo_coverage
-        WHERE start_date <= %s AND end_date >= %s
+        WHERE end_date >= %s AND start_date <= %s
         """
         self._add_evidence("cmo_views.promo_coverage", f"promotions active during '{date_from}' to '{date_to}'")
-        result = self.db.execute_query(query, (date_to, date_from))
+        return query, (date_from, date_to)
+
+    def _parse_promo_summary(self, result: list) -> dict:
         if result:
             return {
                 'promo_count': result[0].get('promo_count', 0) or 0,
@@ -231,6 +321,20 @@ class CMOAgentV2(BaseAgent):
 
     def _get_repeat_rate(self) -> dict:
         """Get repeat purchase rate from cmo_views.repeat_rate."""
+        return self._parse_repeat_rate(self.db.execute_query(*self._repeat_rate_query()))
+
+    def _repeat_rate_query(self) -> tuple:
+        if self._repeat_summary_available:
+            self._add_evidence("cmo_views.repeat_rate_summary", "customer repeat purchase tiers")
+            query = """
+            SELECT
+                s.repeat_customers, s.total_customers, s.repeat_pct,
+                EXTRACT(EPOCH FROM now() - l.refreshed_at) / 3600 AS hours_since_refresh
+            FROM cmo_views.repeat_rate_summary s
+            LEFT JOIN cmo_views.mv_refresh_log l ON l.view_name = 'repeat_rate_summary'
+            """
+            return query, None
+
         query = """
         SELECT
             SUM(CASE WHEN customer_tier != 'One-time' THEN customer_count ELSE 0 END) AS repeat_customers,
@@ -242,12 +346,16 @@ class CMOAgentV2(BaseAgent):
         FROM cmo_views.repeat_rate
         """
         self._add_evidence("cmo_views.repeat_rate", "customer repeat purchase tiers")
-        result = self.db.execute_query(query)
+        return query, None
+
+    def _parse_repeat_rate(self, result: list) -> dict:
         if result:
             return {
                 'repeat_customers': result[0].get('repeat_customers', 0) or 0,
                 'total_customers': result[0].get('total_customers', 0) or 0,
-                'repeat_pct': result[0].get('repeat_pct', 0) or 0
+                'repeat_pct': result[0].get('repeat_pct', 0) or 0,
+                # Only set when read from the materialized summary
+                'hours_since_refresh': result[0].get('hours_since_refresh')
             }
         return {'repeat_pct': 0}
 
@@ -264,22 +372,35 @@ class CMOAgentV2(BaseAgent):
         ORDER BY net_revenue DESC
         LIMIT %s
         """
+        limit = self._clamp_limit(limit)
         self._add_evidence("cmo_views.sales_demand_category", f"top {limit} categories")
         return self.db.execute_query(query, (date_from, date_to, limit))
 
-    def _get_segment_performance(self) -> list:
+    def _get_segment_performance(self, limit: Optional[int] = None) -> list:
         """Get segment performance from cmo_views.segment_performance."""
-        query = "SELECT * FROM cmo_views.segment_performance ORDER BY total_revenue DESC"
+        return self.db.execute_query(*self._segment_performance_query(limit))
+
+    def _segment_performance_query(self, limit: Optional[int] = None) -> tuple:
+        """Segments by revenue, highest first; all of them unless limit is set."""
+        query = """
+        SELECT segment, total_revenue
+        FROM cmo_views.segment_performance
+        ORDER BY total_revenue DESC
+        """
         self._add_evidence("cmo_views.segment_performance", "customer segment aggregates")
-        return self.db.execute_query(query)
+        if limit is None:
+            return query, None
+        return query + "LIMIT %s\n", (self._clamp_limit(limit),)
 
     def _get_brand_performance(self, limit: int = 5) -> list:
         """Get brand performance from cmo_views.brand_performance."""
-        query = f"SELECT * FROM cmo_views.brand_performance ORDER BY net_revenue DESC LIMIT {limit}"
+        query = "SELECT * FROM cmo_views.brand_performance ORDER BY net_revenue DESC LIMIT %s"
+        limit = self._clamp_limit(limit)
         self._add_evidence("cmo_views.brand_performance", f"top {limit} brands")
-        return self.db.execute_query(query)
+        return self.db.execute_query(query, (limit,))
 
-    def _generate_insights(self, sales_data: dict, basket_data: dict, promo_data: dict) -> list:
+    def _generate_insights(self, sales_data: dict, basket_data: dict, promo_data: dict,
+                           segments: list) -> list:
         """Generate CMO insights from allowed views."""
         insights = []
 
@@ -297,8 +418,7 @@ class CMOAgentV2(BaseAgent):
             f"Average basket value ${avg_basket:.2f} with {avg_items:.1f} items per transaction."
         )
 
-        # Segment insight
-        segments = self._get_segment_performance()
+        # Segment insight (segments are ordered by revenue)
         if segments:
             top_segment = segments[0]
             insights.append(
@@ -307,20 +427,16 @@ class CMOAgentV2(BaseAgent):
 
         return insights
 
-    def _identify_risks(self, sales_data: dict, basket_data: dict) -> list:
+    def _identify_risks(self, sales_data: dict, basket_data: dict, repeat_data: dict) -> list:
         """Identify marketing risks from allowed views."""
         risks = []
 
-        # Transaction volume
-        txns = basket_data.get('total_transactions', 0)
-        # Assuming 90 days in Q1
-        if txns > 0:
-            daily_txns = txns / 90
-            if daily_txns < 80:
-                risks.append(f"Low transaction volume: {daily_txns:.0f} daily average.")
+        # Transaction volume, averaged over the days in the period
+        daily_txns = basket_data.get('daily_transactions', 0)
+        if 0 < daily_txns < self.LOW_DAILY_TRANSACTIONS:
+            risks.append(f"Low transaction volume: {daily_txns:.0f} daily average.")
 
         # One-time customer risk
-        repeat_data = self._get_repeat_rate()
         one_time_pct = 100 - repeat_data.get('repeat_pct', 0)
         if one_time_pct > 60:
             risks.append(f"High one-time customer rate: {one_time_pct:.1f}% don't return.")
@@ -331,7 +447,7 @@ class CMOAgentV2(BaseAgent):
         return risks
 
     def _generate_recommendations(self, sales_data: dict, basket_data: dict,
-                                  promo_data: dict) -> list:
+                                  promo_data: dict, repeat_data: dict) -> list:
         """Generate CMO recommendations from allowed view data."""
         recommendations = []
 
@@ -353,7 +469,6 @@ class CMOAgentV2(BaseAgent):
             ))
 
         # Repeat rate
-        repeat_data = self._get_repeat_rate()
         if repeat_data.get('repeat_pct', 0) < 50:
             recommendations.append(Recommendation(
                 action="Launch loyalty program to improve customer retention",
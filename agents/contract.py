@@ -31,7 +31,7 @@ class AgentRole(str, Enum):
     CIO = "CIO"
 
 
-@dataclass
+@dataclass(slots=True)
 class KPI:
     """A single KPI metric card."""
     name: str
@@ -50,7 +50,7 @@ class KPI:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """A recommended action with expected impact."""
     action: str
@@ -65,7 +65,7 @@ class Recommendation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Evidence:
     """Evidence source for agent findings."""
     view: str  # The view/table queried
@@ -79,7 +79,7 @@ class Evidence:
         return d
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentOutput:
     """
     Standard output structure for all boardroom agents.
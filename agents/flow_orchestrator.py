@@ -11,6 +11,7 @@ Flows:
 - Root Cause: CIO → CFO → CMO → Evaluator
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Callable
 from enum import Enum
@@ -321,7 +322,7 @@ class FlowOrchestrator:
             try:
                 # Run agent
                 agent = self.agents[agent_name]
-                output = agent.analyze(session.period_start, session.period_end)
+                output = agent.analyze_cached(session.period_start, session.period_end)
 
                 # Store output
                 session.agent_outputs[agent_name] = output
@@ -374,16 +375,30 @@ class FlowOrchestrator:
                     break
 
             if parallel_group and item == parallel_group[0]:
-                # Execute parallel group
+                # Execute parallel group: the agents are independent and
+                # I/O-bound on Postgres, so analyze them concurrently and
+                # record results in group order
                 for agent_name in parallel_group:
-                    session.current_node = agent_name
                     node = session.nodes[agent_name]
                     node.status = "active"
                     node.started_at = datetime.now().isoformat()
+                session.current_node = parallel_group[-1]
+
+                with ThreadPoolExecutor(max_workers=len(parallel_group)) as executor:
+                    futures = {
+                        agent_name: executor.submit(
+                            self.agents[agent_name].analyze_cached,
+                            session.period_start,
+                            session.period_end,
+                        )
+                        for agent_name in parallel_group
+                    }
+
+                for agent_name in parallel_group:
+                    node = session.nodes[agent_name]
 
                     try:
-                        agent = self.agents[agent_name]
-                        output = agent.analyze(session.period_start, session.period_end)
+                        output = futures[agent_name].result()
                         session.agent_outputs[agent_name] = output
                         node.output = output
                         node.status = "completed"
@@ -413,7 +428,7 @@ class FlowOrchestrator:
 
                 try:
                     agent = self.agents[item]
-                    output = agent.analyze(session.period_start, session.period_end)
+                    output = agent.analyze_cached(session.period_start, session.period_end)
                     session.agent_outputs[item] = output
                     node.output = output
                     node.status = "completed"
@@ -538,51 +553,49 @@ class FlowOrchestrator:
                 risk_level = EXCLUDED.risk_level,
                 final_decision = EXCLUDED.final_decision
             """
-            conn = self.db.connect()
-            with conn.cursor() as cur:
-                cur.execute(query, (
-                    session.session_id,
-                    session.flow_spec.flow_id,
-                    session.flow_spec.name,
-                    session.started_at,
-                    session.ended_at,
-                    session.period_start,
-                    session.period_end,
-                    session.confidence.level.value if session.confidence else None,
-                    session.evaluation.overall_score if session.evaluation else None,
-                    session.evaluation.risk_level if session.evaluation else None,
-                    json.dumps(session.evaluation.to_dict()) if session.evaluation else None,
-                    json.dumps(session.constraints),
-                    session.mode.value,
-                ))
-                conn.commit()
-
-            # Insert agent runs
+            self.db.execute_write(query, (
+                session.session_id,
+                session.flow_spec.flow_id,
+                session.flow_spec.name,
+                session.started_at,
+                session.ended_at,
+                session.period_start,
+                session.period_end,
+                session.confidence.level.value if session.confidence else None,
+                session.evaluation.overall_score if session.evaluation else None,
+                session.evaluation.risk_level if session.evaluation else None,
+                json.dumps(session.evaluation.to_dict()) if session.evaluation else None,
+                json.dumps(session.constraints),
+                session.mode.value,
+            ))
+
+            # Insert agent runs in one batch
+            query = """
+            INSERT INTO retail.agent_run
+            (session_id, agent_name, run_order, started_at, ended_at,
+             status, output_payload, handoff_payload, confidence)
+            VALUES %s
+            ON CONFLICT (session_id, agent_name, run_order) DO NOTHING
+            """
+            rows = []
             for agent_name, node in session.nodes.items():
                 if agent_name == "Evaluator":
                     continue
 
-                query = """
-                INSERT INTO retail.agent_run
-                (session_id, agent_name, run_order, started_at, ended_at,
-                 status, output_payload, handoff_payload, confidence)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (session_id, agent_name, run_order) DO NOTHING
-                """
                 output = session.agent_outputs.get(agent_name)
-                with conn.cursor() as cur:
-                    cur.execute(query, (
-                        session.session_id,
-                        agent_name,
-                        1,
-                        node.started_at,
-                        node.ended_at,
-                        node.status.upper(),
-                        json.dumps(output.to_dict()) if output else None,
-                        json.dumps(node.handoff_out.to_dict()) if node.handoff_out else None,
-                        output.confidence.value if output else None,
-                    ))
-                    conn.commit()
+                rows.append((
+                    session.session_id,
+                    agent_name,
+                    1,
+                    node.started_at,
+                    node.ended_at,
+                    node.status.upper(),
+                    json.dumps(output.to_dict()) if output else None,
+                    json.dumps(node.handoff_out.to_dict()) if node.handoff_out else None,
+                    output.confidence.value if output else None,
+                ))
+            if rows:
+                self.db.execute_values(query, rows)
 
         except Exception as e:
             # Log but don't fail
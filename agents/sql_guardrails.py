@@ -55,6 +55,10 @@ class GuardrailConfig:
     max_rows: int = 5000  # Demo default
     timeout_seconds: float = 5.0
 
+    # Per-sort/hash memory for the role's sessions (Postgres work_mem);
+    # None keeps the server default
+    work_mem: Optional[str] = None
+
     # Fact tables that require date filters
     fact_tables_requiring_date: Set[str] = field(default_factory=set)
 
@@ -121,6 +125,7 @@ AGENT_GUARDRAILS: Dict[str, GuardrailConfig] = {
         max_joins=4,
         max_rows=5000,
         timeout_seconds=5.0,
+        work_mem='64MB',  # Category/store GROUP BYs and DISTINCT counts sort in memory
         fact_tables_requiring_date={
             'cmo_views.sales_demand_category',
             'cmo_views.sales_demand_store',
@@ -387,6 +392,10 @@ class SQLGuardrails:
         """Get the timeout in seconds for this role."""
         return self.config.timeout_seconds
 
+    def get_work_mem(self) -> Optional[str]:
+        """Get the work_mem setting for this role, if any."""
+        return self.config.work_mem
+
     def get_max_rows(self) -> int:
         """Get the max rows limit for this role."""
         return self.config.max_rows
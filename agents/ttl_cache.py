@@ -0,0 +1,67 @@
+"""
+TTL Cache
+=========
+Small thread-safe LRU cache whose entries expire after a fixed time-to-live.
+Used to memoize agent results within a process.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+import threading
+import time
+
+
+class TTLCache:
+    """LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        """
+        Args:
+            maxsize: Max entries kept; the least recently used is evicted first
+            ttl: Seconds an entry stays valid after it is set
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def clear_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop the entries whose key satisfies predicate."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -118,7 +118,7 @@ async def run_kpi_review_flow(request: FlowRequest):
             period_end=request.period_end,
             constraints=request.constraints,
         )
-        session = orchestrator.run_flow(session)
+        session = await asyncio.to_thread(orchestrator.run_flow, session)
 
         # Store session
         sessions[session.session_id] = session
@@ -151,7 +151,7 @@ async def run_trade_off_flow(request: FlowRequest):
             period_end=request.period_end,
             constraints=request.constraints,
         )
-        session = orchestrator.run_flow(session)
+        session = await asyncio.to_thread(orchestrator.run_flow, session)
 
         sessions[session.session_id] = session
 
@@ -192,7 +192,7 @@ async def run_scenario_flow(request: ScenarioRequest):
             period_end=request.period_end,
             constraints=constraints,
         )
-        session = orchestrator.run_flow(session)
+        session = await asyncio.to_thread(orchestrator.run_flow, session)
 
         sessions[session.session_id] = session
 
@@ -222,7 +222,7 @@ async def run_root_cause_flow(request: FlowRequest):
             period_start=request.period_start,
             period_end=request.period_end,
         )
-        session = orchestrator.run_flow(session)
+        session = await asyncio.to_thread(orchestrator.run_flow, session)
 
         sessions[session.session_id] = session
 
@@ -283,7 +283,7 @@ async def stream_flow(
         await asyncio.sleep(0.1)
 
         # Check confidence
-        session.confidence = orchestrator.confidence_engine.assess()
+        session.confidence = await asyncio.to_thread(orchestrator.confidence_engine.assess)
         yield f"event: confidence\ndata: {json.dumps(session.confidence.to_dict())}\n\n"
         await asyncio.sleep(0.1)
 
@@ -304,9 +304,9 @@ async def stream_flow(
             await asyncio.sleep(0.1)
 
             try:
-                # Run agent (this is synchronous, consider ThreadPoolExecutor for production)
+                # Run agent off the event loop so other streams keep flowing
                 agent = orchestrator.agents[agent_name]
-                output = agent.analyze(session.period_start, session.period_end)
+                output = await agent.analyze_cached_async(session.period_start, session.period_end)
 
                 session.agent_outputs[agent_name] = output
                 node.output = output
@@ -613,7 +613,7 @@ async def ask_question(request: AskRequest):
                 period_start=flow_config["period_start"],
                 period_end=flow_config["period_end"],
             )
-            session = orchestrator.run_flow(session)
+            session = await asyncio.to_thread(orchestrator.run_flow, session)
             sessions[session.session_id] = session
 
             response["session_id"] = session.session_id
@@ -709,7 +709,9 @@ async def run_query(request: QueryRequest):
             if "limit" not in sql.lower():
                 sql = sql.rstrip(";") + " LIMIT 100"
 
-            rows = db.execute_query(sql)
+            # One-off generated SQL: run it unprepared so it neither fills
+            # the connection's prepared-statement cache nor resets it on error
+            rows = db.execute_query(sql, prepare=False)
             response["data"] = rows
             response["row_count"] = len(rows)
 
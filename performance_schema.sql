@@ -0,0 +1,367 @@
+-- ============================================================
+-- Boardroom-in-a-Box: Performance Objects (PostgreSQL)
+-- ============================================================
+-- Server-side helpers that let agents fetch their metrics in fewer
+-- round-trips. Run after the retail schema and reporting views exist:
+--   psql -d retail_erp -f performance_schema.sql
+-- Every statement is idempotent and safe to re-run.
+
+-- ----------------------------
+-- CEO SNAPSHOT
+-- ----------------------------
+-- All CEOAgent.analyze metrics as one jsonb document. Each key holds
+-- the row array the matching CEOAgent query would have returned, plus
+-- *_fmt display strings so the agent can skip Python-side formatting.
+
+CREATE OR REPLACE FUNCTION retail.fn_ceo_snapshot(
+    date_from date,
+    date_to   date
+) RETURNS jsonb
+LANGUAGE sql STABLE AS $$
+WITH board AS (
+    SELECT period_start, period_end, net_revenue, units_sold
+    FROM retail.v_board_summary
+),
+monthly AS (
+    SELECT
+        DATE_TRUNC('month', sale_date) AS month,
+        SUM(gross_revenue) AS revenue,
+        SUM(cogs) AS cogs,
+        SUM(gross_margin) AS margin
+    FROM retail.v_margin_daily_store_sku
+    WHERE sale_date BETWEEN date_from AND date_to
+    GROUP BY DATE_TRUNC('month', sale_date)
+),
+margin AS (
+    SELECT
+        SUM(revenue) AS total_revenue,
+        SUM(cogs) AS total_cogs,
+        SUM(margin) AS total_margin,
+        CASE
+            WHEN SUM(revenue) > 0
+            THEN (SUM(margin) / SUM(revenue) * 100)
+            ELSE 0
+        END AS margin_pct,
+        (ARRAY_AGG(margin/NULLIF(revenue,0)*100 ORDER BY month))[1] AS first_month,
+        (ARRAY_AGG(margin/NULLIF(revenue,0)*100 ORDER BY month DESC))[1] AS last_month
+    FROM monthly
+),
+stores AS (
+    SELECT
+        COUNT(DISTINCT store_id) AS active_stores,
+        SUM(net_revenue) AS total_revenue,
+        SUM(net_revenue) / NULLIF(COUNT(DISTINCT store_id), 0) AS avg_revenue_per_store,
+        SUM(units_sold) AS total_units
+    FROM retail.v_sales_daily_store_category
+    WHERE sale_date BETWEEN date_from AND date_to
+),
+categories_regions AS (
+    SELECT
+        CASE WHEN GROUPING(v.category_name) = 0 THEN 'category' ELSE 'region' END AS dim,
+        v.category_name,
+        s.region,
+        COUNT(DISTINCT s.store_id) AS stores,
+        SUM(v.net_revenue) AS revenue,
+        SUM(v.units_sold) AS units
+    FROM retail.v_sales_daily_store_category v
+    LEFT JOIN retail.dim_store s ON s.store_id = v.store_id
+    WHERE v.sale_date BETWEEN date_from AND date_to
+    GROUP BY GROUPING SETS ((v.category_name), (s.region))
+),
+return_totals AS (
+    SELECT
+        COALESCE(SUM(qty) FILTER (WHERE src = 'S'), 0) AS total_sold,
+        COALESCE(SUM(qty) FILTER (WHERE src = 'R'), 0) AS total_returned
+    FROM (
+        SELECT qty, 'S' AS src FROM retail.fact_sales_line
+        WHERE sale_date BETWEEN date_from AND date_to
+        UNION ALL
+        SELECT qty, 'R' AS src FROM retail.fact_returns_line
+        WHERE return_date BETWEEN date_from AND date_to
+    ) t
+),
+returns AS (
+    SELECT
+        total_returned,
+        total_sold,
+        CASE
+            WHEN total_sold > 0
+            THEN (total_returned::float / total_sold * 100)
+            ELSE 0
+        END AS return_rate
+    FROM return_totals
+)
+SELECT jsonb_build_object(
+    'board',          (SELECT COALESCE(jsonb_agg(b), '[]') FROM (
+                          SELECT *,
+                              to_char(net_revenue, 'FM999,999,999,999,990') AS revenue_fmt,
+                              to_char(units_sold, 'FM999,999,999,999,990') AS units_fmt
+                          FROM board) b),
+    'margin',         (SELECT COALESCE(jsonb_agg(m), '[]') FROM (
+                          SELECT *, to_char(margin_pct, 'FM999990.0') AS margin_fmt
+                          FROM margin) m),
+    'stores',         (SELECT COALESCE(jsonb_agg(s), '[]') FROM stores s),
+    'categories_regions',
+                      (SELECT COALESCE(jsonb_agg(c ORDER BY c.revenue DESC), '[]') FROM categories_regions c),
+    'returns',        (SELECT COALESCE(jsonb_agg(x), '[]') FROM (
+                          SELECT *, to_char(return_rate, 'FM999990.0') AS return_rate_fmt
+                          FROM returns) x)
+);
+$$;
+
+-- ----------------------------
+-- CFO MATERIALIZED VIEWS
+-- ----------------------------
+-- CFOAgentV2 re-aggregates cfo_views.daily_pnl and margin_by_category on
+-- every run. Both are converted in place to materialized views with the
+-- same name, definition and SELECT grants, so agent SQL is unchanged.
+-- Refresh them with cfo_views.refresh_materialized_views(); each refresh
+-- is logged so the agent can lower its confidence when data is stale.
+
+CREATE TABLE IF NOT EXISTS cfo_views.mv_refresh_log (
+    view_name    text PRIMARY KEY,
+    refreshed_at timestamptz NOT NULL DEFAULT now()
+);
+
+DO $$
+DECLARE
+    v        text;
+    view_oid oid;
+    def      text;
+    grantees text[];
+    grantee  text;
+BEGIN
+    FOREACH v IN ARRAY ARRAY['daily_pnl', 'margin_by_category'] LOOP
+        SELECT c.oid, rtrim(pg_get_viewdef(c.oid), E'; \n') INTO view_oid, def
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'cfo_views' AND c.relname = v AND c.relkind = 'v';
+
+        CONTINUE WHEN def IS NULL;  -- missing or already materialized
+
+        -- DROP VIEW would fail on views built on top of this one; leave it
+        -- as a plain view rather than abort the whole script
+        IF EXISTS (
+            SELECT 1
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            WHERE d.classid = 'pg_rewrite'::regclass
+              AND d.refobjid = view_oid
+              AND r.ev_class <> view_oid
+        ) THEN
+            RAISE NOTICE 'cfo_views.% has dependent views; not materialized', v;
+            CONTINUE;
+        END IF;
+
+        SELECT array_agg(DISTINCT g.grantee::text) INTO grantees
+        FROM information_schema.role_table_grants g
+        WHERE g.table_schema = 'cfo_views' AND g.table_name = v
+          AND g.privilege_type = 'SELECT';
+
+        EXECUTE format('DROP VIEW cfo_views.%I', v);
+        EXECUTE format('CREATE MATERIALIZED VIEW cfo_views.%I AS %s', v, def);
+        FOREACH grantee IN ARRAY COALESCE(grantees, '{}') LOOP
+            EXECUTE format(
+                'GRANT SELECT ON cfo_views.%I TO %s', v,
+                CASE WHEN grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(grantee) END
+            );
+        END LOOP;
+
+        INSERT INTO cfo_views.mv_refresh_log (view_name) VALUES (v)
+        ON CONFLICT (view_name) DO UPDATE SET refreshed_at = now();
+    END LOOP;
+END $$;
+
+-- Agent queries range-filter both views on sale_date. daily_pnl's index
+-- also carries every column _get_pnl_summary sums, so that query is an
+-- index-only scan once autovacuum has set the visibility map.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews
+               WHERE schemaname = 'cfo_views' AND matviewname = 'daily_pnl') THEN
+        CREATE INDEX IF NOT EXISTS daily_pnl_sale_date_idx
+            ON cfo_views.daily_pnl (sale_date)
+            INCLUDE (gross_revenue, discounts, net_revenue, cogs,
+                     gross_profit, returns, adjusted_gross_profit);
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_matviews
+               WHERE schemaname = 'cfo_views' AND matviewname = 'margin_by_category') THEN
+        CREATE INDEX IF NOT EXISTS margin_by_category_sale_date_idx
+            ON cfo_views.margin_by_category (sale_date);
+    END IF;
+END $$;
+
+-- One-row inventory totals for CFOAgentV2, so valuation is a single-row
+-- read instead of a scan of cfo_views.inventory_value. Refreshed with
+-- the other CFO views; refresh after inventory loads as well.
+DO $$
+DECLARE
+    grantee text;
+BEGIN
+    IF to_regclass('cfo_views.inventory_value') IS NULL
+       OR to_regclass('cfo_views.inventory_value_summary') IS NOT NULL THEN
+        RETURN;
+    END IF;
+
+    CREATE MATERIALIZED VIEW cfo_views.inventory_value_summary AS
+    SELECT
+        SUM(total_on_hand) AS total_units,
+        SUM(inventory_cost_value) AS cost_value,
+        SUM(inventory_retail_value) AS retail_value
+    FROM cfo_views.inventory_value;
+
+    FOR grantee IN
+        SELECT DISTINCT g.grantee::text
+        FROM information_schema.role_table_grants g
+        WHERE g.table_schema = 'cfo_views' AND g.table_name = 'inventory_value'
+          AND g.privilege_type = 'SELECT'
+    LOOP
+        EXECUTE format(
+            'GRANT SELECT ON cfo_views.inventory_value_summary TO %s',
+            CASE WHEN grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(grantee) END
+        );
+    END LOOP;
+
+    INSERT INTO cfo_views.mv_refresh_log (view_name) VALUES ('inventory_value_summary')
+    ON CONFLICT (view_name) DO UPDATE SET refreshed_at = now();
+END $$;
+
+-- CFOAgentV2 reads the refresh log for staleness, so every role that can
+-- read the CFO views can read the log too
+DO $$
+DECLARE
+    grantee text;
+BEGIN
+    FOR grantee IN
+        SELECT DISTINCT g.grantee::text
+        FROM information_schema.role_table_grants g
+        WHERE g.table_schema = 'cfo_views' AND g.table_name <> 'mv_refresh_log'
+          AND g.privilege_type = 'SELECT'
+    LOOP
+        EXECUTE format(
+            'GRANT SELECT ON cfo_views.mv_refresh_log TO %s',
+            CASE WHEN grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(grantee) END
+        );
+    END LOOP;
+END $$;
+
+CREATE OR REPLACE FUNCTION cfo_views.refresh_materialized_views()
+RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    r record;
+BEGIN
+    FOR r IN
+        SELECT c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'cfo_views' AND c.relkind = 'm'
+    LOOP
+        EXECUTE format('REFRESH MATERIALIZED VIEW cfo_views.%I', r.relname);
+        INSERT INTO cfo_views.mv_refresh_log (view_name) VALUES (r.relname)
+        ON CONFLICT (view_name) DO UPDATE SET refreshed_at = now();
+    END LOOP;
+END $$;
+
+-- Hourly refresh, where pg_cron is available:
+--   SELECT cron.schedule('cfo-mv-refresh', '0 * * * *',
+--                        'SELECT cfo_views.refresh_materialized_views()');
+
+-- ----------------------------
+-- CMO INDEXES
+-- ----------------------------
+-- CMO agents look up promotions overlapping the analysis period
+-- (end_date >= from AND start_date <= to), through cmo_views.promo_coverage
+-- and directly. Leading on end_date lets the planner skip promotions that
+-- ended before the period, which is most of the history.
+
+CREATE INDEX IF NOT EXISTS promotion_end_start_idx
+    ON retail.promotion (end_date, start_date);
+
+-- ----------------------------
+-- CMO MATERIALIZED VIEWS
+-- ----------------------------
+-- One-row repeat purchase totals for CMOAgentV2, so the repeat rate is a
+-- single-row read instead of re-aggregating cmo_views.repeat_rate on
+-- every run. The agent falls back to the aggregate while this is absent.
+-- Refreshes are logged in cmo_views.mv_refresh_log, which the agent reads
+-- alongside the summary to lower its confidence when it is stale.
+
+CREATE TABLE IF NOT EXISTS cmo_views.mv_refresh_log (
+    view_name    text PRIMARY KEY,
+    refreshed_at timestamptz NOT NULL DEFAULT now()
+);
+
+DO $$
+DECLARE
+    grantee text;
+BEGIN
+    IF to_regclass('cmo_views.repeat_rate') IS NULL THEN
+        RETURN;
+    END IF;
+
+    IF to_regclass('cmo_views.repeat_rate_summary') IS NULL THEN
+        CREATE MATERIALIZED VIEW cmo_views.repeat_rate_summary AS
+        SELECT
+            COALESCE(SUM(customer_count) FILTER (WHERE customer_tier != 'One-time'), 0) AS repeat_customers,
+            SUM(customer_count) AS total_customers,
+            ROUND(
+                COALESCE(SUM(customer_count) FILTER (WHERE customer_tier != 'One-time'), 0)::numeric /
+                NULLIF(SUM(customer_count), 0) * 100, 1
+            ) AS repeat_pct
+        FROM cmo_views.repeat_rate;
+
+        INSERT INTO cmo_views.mv_refresh_log (view_name) VALUES ('repeat_rate_summary')
+        ON CONFLICT (view_name) DO UPDATE SET refreshed_at = now();
+    ELSIF NOT EXISTS (SELECT 1 FROM cmo_views.mv_refresh_log
+                      WHERE view_name = 'repeat_rate_summary') THEN
+        -- Created before refreshes were logged: refresh once to start the log
+        REFRESH MATERIALIZED VIEW cmo_views.repeat_rate_summary;
+        INSERT INTO cmo_views.mv_refresh_log (view_name) VALUES ('repeat_rate_summary');
+    END IF;
+
+    -- Whoever may read the repeat rate may read its summary and its age
+    FOR grantee IN
+        SELECT DISTINCT g.grantee::text
+        FROM information_schema.role_table_grants g
+        WHERE g.table_schema = 'cmo_views' AND g.table_name = 'repeat_rate'
+          AND g.privilege_type = 'SELECT'
+    LOOP
+        EXECUTE format(
+            'GRANT SELECT ON cmo_views.repeat_rate_summary, cmo_views.mv_refresh_log TO %s',
+            CASE WHEN grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(grantee) END
+        );
+    END LOOP;
+END $$;
+
+-- The summary is a single row, so a plain refresh holds its lock only
+-- briefly and CONCURRENTLY (which needs a unique index) buys nothing.
+CREATE OR REPLACE FUNCTION cmo_views.refresh_materialized_views()
+RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    r record;
+BEGIN
+    FOR r IN
+        SELECT c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'cmo_views' AND c.relkind = 'm'
+    LOOP
+        EXECUTE format('REFRESH MATERIALIZED VIEW cmo_views.%I', r.relname);
+        INSERT INTO cmo_views.mv_refresh_log (view_name) VALUES (r.relname)
+        ON CONFLICT (view_name) DO UPDATE SET refreshed_at = now();
+    END LOOP;
+END $$;
+
+-- Nightly refresh. Scheduled here when pg_cron is installed in this
+-- database (re-running updates the job in place); otherwise run
+--   SELECT cmo_views.refresh_materialized_views();
+-- from the nightly ETL after cmo_views' sources are loaded.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('cmo-mv-refresh', '0 2 * * *',
+                              'SELECT cmo_views.refresh_materialized_views()');
+    END IF;
+END $$;
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test Result Caches
+==================
+Tests for the TTL cache and the agent result caches built on it.
+No database is needed: agents run against a stub connection.
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from contextlib import contextmanager
+
+from agents import base_agent, ttl_cache
+from agents.base_agent import BaseAgent
+from agents.contract import AgentOutput, AgentRole, KPI, Trend, Confidence
+from agents.ttl_cache import TTLCache
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _StubDB:
+    """Connection stub: a config to key caches by and a no-op transaction."""
+
+    def __init__(self, **config):
+        self.config = dict(host="localhost", port=5432, database="retail_erp", user="u", **config)
+
+    @contextmanager
+    def read_only_transaction(self):
+        yield
+
+
+class _CountingAgent(BaseAgent):
+    """Agent whose analyze() counts calls and reports the database it saw."""
+
+    def __init__(self, db):
+        super().__init__(db=db)
+        self.calls = 0
+
+    @property
+    def role(self) -> AgentRole:
+        return AgentRole.CIO
+
+    def analyze(self, date_from: str = None, date_to: str = None) -> AgentOutput:
+        self.calls += 1
+        self._add_evidence("stub.view", self.db.config['database'])
+        return AgentOutput(
+            agent=self.role,
+            kpis=[KPI(name="Calls", value=self.calls, unit="count", trend=Trend.FLAT, window="Current")],
+            insights=[f"Database {self.db.config['database']}"],
+            risks=[],
+            recommendations=[],
+            evidence=self._evidence,
+            confidence=Confidence.HIGH
+        )
+
+
+def test_ttl_cache_expiry(monkeypatch):
+    """Entries are returned until their TTL passes, then dropped."""
+    clock = _Clock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    cache = TTLCache(maxsize=4, ttl=10)
+
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction():
+    """When full, the least recently used entry is evicted first."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_pop_and_clear():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalidate_clears_agent_caches():
+    """BaseAgent.invalidate() drops run, query and date-range results."""
+    base_agent._RUN_CACHE.set("run", "x")
+    base_agent._QUERY_CACHE.set("query", [])
+    base_agent._DATE_RANGE_CACHE.set("range", ("2025-01-01", "2025-03-31"))
+
+    BaseAgent.invalidate()
+
+    assert base_agent._RUN_CACHE.get("run") is None
+    assert base_agent._QUERY_CACHE.get("query") is None
+    assert base_agent._DATE_RANGE_CACHE.get("range") is None
+
+
+def test_run_cache_hits_and_invalidate():
+    """run() answers repeats from cache until invalidate() is called."""
+    BaseAgent.invalidate()
+    agent = _CountingAgent(_StubDB())
+
+    first = agent.run("2025-01-01", "2025-03-31")
+    assert agent.run("2025-01-01", "2025-03-31") == first
+    assert agent.calls == 1
+
+    agent.run("2025-04-01", "2025-06-30")
+    assert agent.calls == 2
+
+    BaseAgent.invalidate()
+    agent.run("2025-01-01", "2025-03-31")
+    assert agent.calls == 3
+
+
+def test_run_cache_is_scoped_by_database():
+    """Agents of one class on different databases never share run() results."""
+    BaseAgent.invalidate()
+    local = _CountingAgent(_StubDB())
+    cloud = _CountingAgent(_StubDB())
+    cloud.db.config.update(host="db.example.com", database="postgres")
+
+    local_out = local.run("2025-01-01", "2025-03-31")
+    cloud_out = cloud.run("2025-01-01", "2025-03-31")
+
+    assert local.calls == 1 and cloud.calls == 1
+    assert "retail_erp" in local_out
+    assert "postgres" in cloud_out
+
+
+def test_ttl_cache_clear_matching():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set(("db1", "a"), 1)
+    cache.set(("db1", "b"), 2)
+    cache.set(("db2", "a"), 3)
+
+    cache.clear_matching(lambda key: key[0] == "db1")
+
+    assert len(cache) == 1
+    assert cache.get(("db2", "a")) == 3
+
+
+class _VersionedDB(_StubDB):
+    """Stub whose data_version() can be bumped to simulate a data load."""
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.version = 1
+
+    def data_version(self):
+        return self.version
+
+
+def test_data_version_change_invalidates_only_that_database():
+    """New writes on one database leave another database's cache alone."""
+    BaseAgent.invalidate()
+    base_agent._DATA_VERSION_CACHE.clear()
+    base_agent._DATA_VERSIONS.clear()
+
+    local = _CountingAgent(_VersionedDB())
+    cloud = _CountingAgent(_VersionedDB())
+    cloud.db.config.update(host="db.example.com", database="postgres")
+    local.run("2025-01-01", "2025-03-31")
+    cloud.run("2025-01-01", "2025-03-31")
+
+    # Skip the once-a-minute poll throttle so the bump is seen right away
+    local.db.version = 2
+    base_agent._DATA_VERSION_CACHE.clear()
+    local.run("2025-01-01", "2025-03-31")
+    cloud.run("2025-01-01", "2025-03-31")
+
+    assert local.calls == 2
+    assert cloud.calls == 1
+
+
+def test_feature_probes_are_shared_per_database():
+    """A missing optional object is remembered for its database only."""
+    BaseAgent.invalidate()
+    first = _CountingAgent(_StubDB())
+    second = _CountingAgent(_StubDB())
+    other = _CountingAgent(_StubDB())
+    other.db.config.update(host="db.example.com", database="postgres")
+
+    assert first._feature_available("retail.fn_ceo_snapshot") is None
+    first._set_feature_available("retail.fn_ceo_snapshot", False)
+
+    assert second._feature_available("retail.fn_ceo_snapshot") is False
+    assert other._feature_available("retail.fn_ceo_snapshot") is None
+
+    BaseAgent.invalidate()
+    assert second._feature_available("retail.fn_ceo_snapshot") is None
+
+
+def test_analyze_cached_returns_independent_outputs():
+    """analyze_cached() hits run()'s cache but never hands out a shared object."""
+    BaseAgent.invalidate()
+    agent = _CountingAgent(_StubDB())
+
+    first = agent.analyze_cached("2025-01-01", "2025-03-31")
+    first.insights.append("mutated by caller")
+    second = agent.analyze_cached("2025-01-01", "2025-03-31")
+
+    assert agent.calls == 1
+    assert second is not first
+    assert "mutated by caller" not in second.insights
+    assert second.kpis[0].value == 1
@@ -275,6 +275,61 @@ def test_agent_with_guardrails():
     return tests_failed == 0
 
 
+def test_parameterized_limits_are_clamped():
+    """A bound LIMIT never exceeds the role's max_rows."""
+    from agents.ceo_agent_v2 import CEOAgentV2
+
+    ceo = CEOAgentV2(db=GuardrailedDatabaseConnection(role="CEO"))
+    max_rows = ceo.db.get_guardrails().get_max_rows()
+
+    assert ceo._category_performance_query(5)[1] == (5,)
+    assert ceo._category_performance_query(max_rows * 10)[1] == (max_rows,)
+
+    from agents.cmo_agent_v2 import CMOAgentV2
+
+    cmo = CMOAgentV2(db=GuardrailedDatabaseConnection(role="CMO"))
+    max_rows = cmo.db.get_guardrails().get_max_rows()
+    assert cmo._segment_performance_query(max_rows * 10)[1] == (max_rows,)
+
+
+def test_cio_health_history_passes_guardrails():
+    """Health history carries a check_date filter and gets the role's row limit."""
+    query = """
+    SELECT * FROM cio_views.health_check_history
+    WHERE check_date >= CURRENT_DATE - %s::int
+    ORDER BY check_date DESC
+    """
+    db = GuardrailedDatabaseConnection(role="CIO")
+
+    assert validate_query("CIO", query)[0]
+    assert db._check_query(query).rstrip().endswith(f"LIMIT {db.get_guardrails().get_max_rows()}")
+
+
+def test_work_mem_by_role():
+    """Only CMO raises work_mem; other roles keep the server default."""
+    from agents.sql_guardrails import GuardrailConfig
+
+    assert GuardrailConfig().work_mem is None
+    assert SQLGuardrails("CMO").get_work_mem() == "64MB"
+    for role in ("CEO", "CFO", "CIO", "EVAL"):
+        assert SQLGuardrails(role).get_work_mem() is None
+
+
+def test_session_options_include_work_mem_for_cmo_only():
+    """work_mem rides on the connect-time options next to statement_timeout."""
+    cmo = GuardrailedDatabaseConnection(role="CMO")
+    timeout_ms = int(cmo.get_guardrails().get_timeout() * 1000)
+    assert cmo.config["options"] == f"-c statement_timeout={timeout_ms} -c work_mem=64MB"
+
+    for role in ("CEO", "CFO", "CIO"):
+        options = GuardrailedDatabaseConnection(role=role).config["options"]
+        assert options.startswith("-c statement_timeout=")
+        assert "work_mem" not in options
+
+    unguarded = GuardrailedDatabaseConnection(role="CMO", enforce_guardrails=False)
+    assert "options" not in unguarded.config
+
+
 def main():
     print("\n" + "=" * 70)
     print("SQL GUARDRAILS TEST SUITE")
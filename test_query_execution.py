@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Test Query Execution
+====================
+Tests the exact SQL that DatabaseConnection sends for prepared statements
+and batched queries. No database is needed: a stub cursor records every
+statement and its params.
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import hashlib
+from contextlib import nullcontext
+
+import psycopg2
+import pytest
+
+from agents import base_agent
+from agents.base_agent import DatabaseConnection
+
+
+class _StubConnection:
+    """Connection stub: identifies the server session and hands out its cursor."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        base_agent._SESSIONS[self] = base_agent._SessionState()
+
+    def cursor(self):
+        return self._cursor
+
+
+class _StubCursor:
+    """Cursor stub that records execute() calls and can fail on demand."""
+
+    def __init__(self, row=None):
+        self.connection = _StubConnection(self)
+        self.executed = []
+        self.fail_next = False
+        self.row = row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if self.fail_next:
+            self.fail_next = False
+            raise psycopg2.Error("boom")
+
+    def mogrify(self, sql, params=None):
+        def quote(value):
+            return f"'{value}'" if isinstance(value, str) else str(value)
+        if isinstance(params, dict):
+            return (sql % {k: quote(v) for k, v in params.items()}).encode()
+        if params:
+            return (sql % tuple(quote(v) for v in params)).encode()
+        return sql.encode()
+
+    def fetchone(self):
+        return self.row
+
+
+def _name(query: str) -> str:
+    """Prepared statement name DatabaseConnection derives for a query."""
+    return "ps_" + hashlib.md5(query.encode()).hexdigest()[:16]
+
+
+def test_placeholders_renumbered_and_plan_reused():
+    """%s becomes $1..$n in PREPARE; later calls only send EXECUTE."""
+    db = DatabaseConnection()
+    cur = _StubCursor()
+    query = "SELECT * FROM t WHERE a = %s AND b BETWEEN %s AND %s"
+    name = _name(query)
+
+    db._execute(cur, query, (1, "2025-01-01", "2025-03-31"), prepare=True)
+    db._execute(cur, query, (2, "2025-04-01", "2025-06-30"), prepare=True)
+
+    assert cur.executed == [
+        (f"PREPARE {name} AS SELECT * FROM t WHERE a = $1 AND b BETWEEN $2 AND $3;\n"
+         f"EXECUTE {name}(%s, %s, %s)", (1, "2025-01-01", "2025-03-31")),
+        (f"EXECUTE {name}(%s, %s, %s)", (2, "2025-04-01", "2025-06-30")),
+    ]
+
+
+def test_literal_percent_kept_for_psycopg2():
+    """%% is left alone when params are bound; a bare % passes through without params."""
+    db = DatabaseConnection()
+    cur = _StubCursor()
+    with_params = "SELECT name FROM t WHERE name LIKE 'a%%' AND id = %s"
+    without_params = "SELECT name FROM t WHERE name LIKE 'a%'"
+
+    db._execute(cur, with_params, (7,), prepare=True)
+    db._execute(cur, without_params, None, prepare=True)
+
+    assert cur.executed == [
+        (f"PREPARE {_name(with_params)} AS "
+         "SELECT name FROM t WHERE name LIKE 'a%%' AND id = $1;\n"
+         f"EXECUTE {_name(with_params)}(%s)", (7,)),
+        (f"PREPARE {_name(without_params)} AS SELECT name FROM t WHERE name LIKE 'a%';\n"
+         f"EXECUTE {_name(without_params)}", None),
+    ]
+
+
+@pytest.mark.parametrize("query, params, prepare", [
+    ("SELECT %s", (1,), False),
+    ("SELECT %(x)s", {"x": 1}, True),
+    ("INSERT INTO t VALUES (%s)", (1,), True),
+    ("SELECT 1; SELECT 2", None, True),
+])
+def test_unpreparable_queries_run_verbatim(query, params, prepare):
+    db = DatabaseConnection()
+    cur = _StubCursor()
+
+    db._execute(cur, query, params, prepare=prepare)
+
+    assert cur.executed == [(query, params)]
+
+
+def test_lru_eviction_deallocates_oldest():
+    """Past PREPARED_CACHE_SIZE the least recently used statement is DEALLOCATEd."""
+    db = DatabaseConnection()
+    db.PREPARED_CACHE_SIZE = 2
+    cur = _StubCursor()
+    first, second, third = "SELECT 1", "SELECT 2", "SELECT 3"
+
+    db._execute(cur, first, None, prepare=True)
+    db._execute(cur, second, None, prepare=True)
+    # Reusing the first statement makes the second the oldest
+    db._execute(cur, first, None, prepare=True)
+    db._execute(cur, third, None, prepare=True)
+
+    assert cur.executed[-1] == (
+        f"DEALLOCATE {_name(second)};\n"
+        f"PREPARE {_name(third)} AS SELECT 3;\n"
+        f"EXECUTE {_name(third)}", None
+    )
+
+
+def test_failure_recovers_with_deallocate_all():
+    """After an error the next statement clears the session and re-prepares."""
+    db = DatabaseConnection()
+    cur = _StubCursor()
+    query = "SELECT * FROM t WHERE id = %s"
+    name = _name(query)
+
+    db._execute(cur, query, (1,), prepare=True)
+    cur.fail_next = True
+    with pytest.raises(psycopg2.Error):
+        db._execute(cur, query, (2,), prepare=True)
+    db._execute(cur, query, (3,), prepare=True)
+
+    assert cur.executed[1] == (f"EXECUTE {name}(%s)", (2,))
+    assert cur.executed[2] == (
+        "DEALLOCATE ALL;\n"
+        f"PREPARE {name} AS SELECT * FROM t WHERE id = $1;\n"
+        f"EXECUTE {name}(%s)", (3,)
+    )
+
+
+def _batch_db(cur: _StubCursor) -> DatabaseConnection:
+    """DatabaseConnection whose every call runs on cur."""
+    db = DatabaseConnection()
+    db._connection = lambda autocommit=True: nullcontext(cur.connection)
+    return db
+
+
+def _column(i: int, body: str) -> str:
+    """One member of a batch SELECT, as execute_many_queries() builds it."""
+    return f"(SELECT COALESCE(json_agg(q), '[]'::json) FROM ({body}\n) q) AS r{i}"
+
+
+def test_batch_renumbers_args_across_members_and_escapes_percent():
+    """Args are concatenated in order; % in unparameterized members is escaped."""
+    cur = _StubCursor(row=([{"a": 1}], [], [{"c": 3}]))
+    db = _batch_db(cur)
+    queries = [
+        ("SELECT a FROM t WHERE d BETWEEN %s AND %s", ("2025-01-01", "2025-03-31")),
+        ("SELECT b FROM u WHERE s LIKE 'a%'", None),
+        ("SELECT c FROM v WHERE id = %s;", (3,)),
+    ]
+
+    result = db.execute_many_queries(queries)
+
+    batch = "SELECT " + ",\n".join([
+        _column(0, "SELECT a FROM t WHERE d BETWEEN %s AND %s"),
+        _column(1, "SELECT b FROM u WHERE s LIKE 'a%%'"),
+        _column(2, "SELECT c FROM v WHERE id = %s"),
+    ])
+    prepared = "SELECT " + ",\n".join([
+        _column(0, "SELECT a FROM t WHERE d BETWEEN $1 AND $2"),
+        _column(1, "SELECT b FROM u WHERE s LIKE 'a%%'"),
+        _column(2, "SELECT c FROM v WHERE id = $3"),
+    ])
+    assert cur.executed == [(
+        f"PREPARE {_name(batch)} AS {prepared};\n"
+        f"EXECUTE {_name(batch)}(%s, %s, %s)",
+        ("2025-01-01", "2025-03-31", 3),
+    )]
+    assert result == [[{"a": 1}], [], [{"c": 3}]]
+
+
+def test_batch_without_args_leaves_percent_alone():
+    cur = _StubCursor(row=([], []))
+    db = _batch_db(cur)
+
+    db.execute_many_queries([
+        ("SELECT b FROM u WHERE s LIKE 'a%'", None),
+        ("SELECT 1", ()),
+    ])
+
+    batch = "SELECT " + ",\n".join([
+        _column(0, "SELECT b FROM u WHERE s LIKE 'a%'"),
+        _column(1, "SELECT 1"),
+    ])
+    assert cur.executed == [(f"PREPARE {_name(batch)} AS {batch};\nEXECUTE {_name(batch)}", None)]
+
+
+def test_batch_with_named_params_is_mogrified_and_unprepared():
+    """A dict-params member inlines every member's values and skips PREPARE."""
+    cur = _StubCursor(row=([], []))
+    db = _batch_db(cur)
+
+    db.execute_many_queries([
+        ("SELECT a FROM t WHERE d >= %(date_from)s", {"date_from": "2025-01-01"}),
+        ("SELECT c FROM v WHERE id = %s", (3,)),
+    ])
+
+    assert cur.executed == [("SELECT " + ",\n".join([
+        _column(0, "SELECT a FROM t WHERE d >= '2025-01-01'"),
+        _column(1, "SELECT c FROM v WHERE id = 3"),
+    ]), None)]
+
+
+def test_empty_batch_skips_the_database():
+    db = DatabaseConnection()
+    db._connection = None  # would fail if touched
+
+    assert db.execute_many_queries([]) == []